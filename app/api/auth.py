@@ -2,9 +2,12 @@ import os
 from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import RedirectResponse
 from authlib.integrations.starlette_client import OAuth
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.user import User, OAuthToken
+from app.core.credentials import credential_cache
+from app.core.user_cache import get_user, public_user, invalidate_user
 from tools.utils.config import Config
 
 router = APIRouter()
@@ -23,6 +26,47 @@ oauth.register(
     }
 )
 
+def upsert_login(db: Session, user_info, token):
+    """
+    Creates or updates the user (by email) and their OAuth token in a single
+    transaction. Returns the user id.
+    """
+    # INSERT ... ON CONFLICT DO UPDATE; only the dialect in use is imported
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(User).values(
+        email=user_info['email'],
+        name=user_info.get('name'),
+        avatar_url=user_info.get('picture')
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={"name": stmt.excluded.name, "avatar_url": stmt.excluded.avatar_url}
+    ).returning(User.id)
+    user_id = db.execute(stmt).scalar_one()
+
+    stmt = insert(OAuthToken).values(
+        user_id=user_id,
+        access_token=token.get('access_token'),
+        refresh_token=token.get('refresh_token'),
+        expires_at=token.get('expires_at')
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[OAuthToken.user_id],
+        set_={
+            "access_token": stmt.excluded.access_token,
+            # Google only sends a refresh token on first consent: keep the stored one
+            "refresh_token": func.coalesce(stmt.excluded.refresh_token, OAuthToken.refresh_token),
+            "expires_at": stmt.excluded.expires_at
+        }
+    )
+    db.execute(stmt)
+    db.commit()
+    return user_id
+
 @router.get("/login")
 async def login(request: Request):
     """Redirects user to Google Login."""
@@ -39,39 +83,14 @@ async def auth_callback(request: Request, db: Session = Depends(get_db)):
         if not user_info:
              raise HTTPException(status_code=400, detail="Failed to retrieve user info")
 
-        # Check if user exists
-        user = db.query(User).filter(User.email == user_info['email']).first()
-        
-        if not user:
-            # Create new user
-            user = User(
-                email=user_info['email'],
-                name=user_info.get('name'),
-                avatar_url=user_info.get('picture')
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        else:
-            # Update info if changed
-            user.name = user_info.get('name')
-            user.avatar_url = user_info.get('picture')
-            db.commit()
-
-        # Update/Create Token
         # We store the access token to use for API calls later
-        oauth_token = db.query(OAuthToken).filter(OAuthToken.user_id == user.id).first()
-        if not oauth_token:
-            oauth_token = OAuthToken(user_id=user.id)
-            db.add(oauth_token)
-        
-        oauth_token.access_token = token.get('access_token')
-        oauth_token.refresh_token = token.get('refresh_token')
-        oauth_token.expires_at = token.get('expires_at')
-        db.commit()
+        user_id = upsert_login(db, user_info, token)
+        # Drop cached rows and any credentials built from the previous token
+        invalidate_user(user_id)
+        credential_cache.invalidate(user_id)
 
         # Set Session
-        request.session['user_id'] = user.id
+        request.session['user_id'] = user_id
         
         return RedirectResponse(url="/")
         
@@ -89,7 +108,7 @@ async def get_current_user(request: Request, db: Session = Depends(get_db)):
     user_id = request.session.get('user_id')
     if not user_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_user(user_id, db)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    return public_user(user)
@@ -0,0 +1,79 @@
+import json
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from app.core.database import SessionLocal
+from app.core.jobs import jobs
+from app.api.run_brief import build_brief
+
+router = APIRouter()
+
+# Comment lines sent while a job is quiet keep proxies (e.g. Render) from timing out
+KEEPALIVE_SECONDS = 15
+
+def _get_job(request: Request, job_id: str):
+    job = jobs.get(job_id)
+    if not job or job.user_id != request.session.get('user_id'):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/brief-jobs", status_code=202)
+async def submit_brief_job(request: Request, refresh: bool = False):
+    """
+    Queues a Daily Brief build and returns its job id immediately.
+    Poll GET /brief-jobs/{id} or stream GET /brief-jobs/{id}/events.
+    A fresh precomputed brief completes the job straight away unless `refresh=true`.
+    """
+    user_id = request.session.get('user_id')
+
+    def work(on_section):
+        db = SessionLocal()
+        try:
+            return build_brief(user_id, db, on_section=on_section, use_stored=not refresh)
+        finally:
+            db.close()
+
+    job = jobs.submit(user_id, work)
+    return {"job_id": job.id, "status": job.status}
+
+@router.get("/brief-jobs/{job_id}")
+async def get_brief_job(job_id: str, request: Request):
+    """Job status plus every section completed so far (and the brief once done)."""
+    return _get_job(request, job_id).to_dict()
+
+@router.get("/brief-jobs/{job_id}/events")
+async def stream_brief_job(job_id: str, request: Request):
+    """
+    Server-Sent Events: one `section` event per completed source, then `done`
+    (full brief) or `failed`. Replays earlier events for late subscribers.
+    """
+    job = _get_job(request, job_id)
+
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        unsubscribe = job.subscribe(lambda: loop.call_soon_threadsafe(wake.set))
+        index = 0
+        try:
+            while True:
+                wake.clear()
+                events, finished = job.events_since(index)
+                for event, data in events:
+                    yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+                index += len(events)
+                if finished:
+                    return
+                if await request.is_disconnected():
+                    return
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            unsubscribe()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Request, HTTPException
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.brief_store import list_briefs, get_brief, get_previous_date, diff_briefs
+
+router = APIRouter()
+
+def _require_user(request: Request):
+    user_id = request.session.get('user_id')
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return user_id
+
+@router.get("/briefs")
+def brief_history(request: Request, limit: int = 30, db: Session = Depends(get_db)):
+    """Dates of the user's stored briefs, newest first."""
+    return list_briefs(db, _require_user(request), limit=min(limit, 365))
+
+@router.get("/briefs/{date}")
+def brief_for_date(date: str, request: Request, db: Session = Depends(get_db)):
+    """The stored brief for `date` (YYYY-MM-DD)."""
+    brief = get_brief(db, _require_user(request), date)
+    if not brief:
+        raise HTTPException(status_code=404, detail="No brief stored for that date")
+    return brief
+
+@router.get("/briefs/{date}/diff")
+def brief_diff(date: str, request: Request, against: str = None, db: Session = Depends(get_db)):
+    """
+    What changed between the brief for `date` and the one for `against`
+    (default: the previous stored brief).
+    """
+    user_id = _require_user(request)
+    brief = get_brief(db, user_id, date)
+    if not brief:
+        raise HTTPException(status_code=404, detail="No brief stored for that date")
+
+    against = against or get_previous_date(db, user_id, date)
+    previous = get_brief(db, user_id, against) if against else None
+    if not previous:
+        raise HTTPException(status_code=404, detail="No earlier brief to compare with")
+    return diff_briefs(previous, brief)
@@ -1,65 +1,60 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
-from google.oauth2.credentials import Credentials
 from app.core.database import get_db
-from app.models.user import User, OAuthToken
-from tools.navigation import generate_daily_brief
+from app.core.executor import run_in_brief_executor
+from app.core.brief_store import save_brief, get_fresh_brief
+from app.core.credentials import get_google_creds
+import os
 import traceback
 import json
+from datetime import timedelta
 
 router = APIRouter()
 
-def get_google_creds(user_id: int, db: Session):
-    token = db.query(OAuthToken).filter(OAuthToken.user_id == user_id).first()
-    if not token:
-        return None
-        
-    # Reconstruct Credentials object from stored tokens
-    try:
-        from tools.utils.config import Config
-        import os
-        
-        # We need client config to allow refreshing
-        # This is a bit hacky to read from env here but works
-        client_id = os.getenv("GOOGLE_CLIENT_ID")
-        client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
-        token_uri = "https://oauth2.googleapis.com/token"
-        
-        creds = Credentials(
-            token=token.access_token,
-            refresh_token=token.refresh_token,
-            token_uri=token_uri,
-            client_id=client_id,
-            client_secret=client_secret,
-            scopes=['https://www.googleapis.com/auth/gmail.readonly', 'https://www.googleapis.com/auth/calendar.readonly']
-        )
-        return creds
-    except Exception as e:
-        print(f"[AUTH ERROR] Failed to reconstruct creds: {e}")
-        return None
+# Stored briefs younger than this are served without regenerating
+BRIEF_FRESH_MINUTES = int(os.getenv("BRIEF_FRESH_MINUTES", "120"))
+
+def build_brief(user_id, db: Session, on_section=None, use_stored=True):
+    """
+    Blocking part of /run-brief: credential lookup and brief generation.
+    Serves today's stored (e.g. precomputed) brief while it is fresh, and
+    stores every brief built for a signed-in user.
+    """
+    if user_id and use_stored:
+        stored = get_fresh_brief(db, user_id, timedelta(minutes=BRIEF_FRESH_MINUTES))
+        if stored:
+            print(f"[API] Serving stored brief for User ID {user_id}.")
+            return stored
+
+    creds = None
+    if user_id:
+        print(f"[API] Fetching credentials for User ID {user_id}...")
+        creds = get_google_creds(user_id, db)
+        if not creds:
+            print("[WARN] User found but no Google Token in DB.")
+    else:
+        print("[WARN] No active session. Attempting legacy local mode (will fail on Render).")
+
+    # Call the existing logic directly (imported here: it pulls in every integration)
+    from tools.navigation import generate_daily_brief
+    # navigation.py's generate_daily_brief returns the 'daily_brief' dict
+    print("[API] Triggering Daily Brief generation...")
+    brief, slack_payload = generate_daily_brief(creds=creds, user_id=user_id, on_section=on_section)
+    if user_id:
+        save_brief(db, user_id, brief)
+    return brief
 
 @router.post("/run-brief")
-async def run_brief(request: Request, db: Session = Depends(get_db)):
+async def run_brief(request: Request, refresh: bool = False, db: Session = Depends(get_db)):
     """
     Triggers the Daily Executive Brief generation.
     Returns the generated JSON data.
+    A fresh precomputed brief is returned as-is unless `refresh=true`.
+    Generation runs on the bounded brief executor, keeping the event loop free.
     """
     try:
         user_id = request.session.get('user_id')
-        creds = None
-        if user_id:
-            print(f"[API] Fetching credentials for User ID {user_id}...")
-            creds = get_google_creds(user_id, db)
-            if not creds:
-                print("[WARN] User found but no Google Token in DB.")
-        else:
-            print("[WARN] No active session. Attempting legacy local mode (will fail on Render).")
-
-        # Call the existing logic directly
-        # navigation.py's generate_daily_brief returns the 'daily_brief' dict
-        print("[API] Triggering Daily Brief generation...")
-        brief, slack_payload = generate_daily_brief(creds=creds)
-        return brief
+        return await run_in_brief_executor(build_brief, user_id, db, use_stored=not refresh)
     except Exception as e:
         print(f"[API ERROR] {e}")
         traceback.print_exc()
@@ -0,0 +1,119 @@
+import json
+import zlib
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.models.brief import BriefHistory
+
+# List sections compared by `diff_briefs`, with the key identifying an item
+DIFF_SECTIONS = {
+    "priorities": "task_id",
+    "meeting_insights": "meeting_id",
+    "schedule.events": "event_id",
+    "flagged_emails": "id",
+    "metrics": "metric",
+}
+
+def encode_brief(brief: dict):
+    """Returns (compressed payload, uncompressed size in bytes)."""
+    raw = json.dumps(brief, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw), len(raw)
+
+def decode_brief(payload: bytes) -> dict:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+def save_brief(db: Session, user_id: int, brief: dict):
+    """
+    Stores `brief` as the user's brief for its date, replacing an earlier one.
+    A single upsert, so overlapping saves (precompute plus a click, two tabs)
+    don't race on the (user_id, date) constraint.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    payload, size = encode_brief(brief)
+    stmt = insert(BriefHistory).values(
+        user_id=user_id, date=brief["date"], payload=payload, size=size, generated_at=datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BriefHistory.user_id, BriefHistory.date],
+        set_={"payload": stmt.excluded.payload, "size": stmt.excluded.size, "generated_at": stmt.excluded.generated_at}
+    )
+    db.execute(stmt)
+    db.commit()
+
+def get_brief(db: Session, user_id: int, date: str):
+    """Returns the stored brief for `date` (YYYY-MM-DD), or None."""
+    row = db.query(BriefHistory).filter(
+        BriefHistory.user_id == user_id, BriefHistory.date == date
+    ).first()
+    return decode_brief(row.payload) if row else None
+
+def get_previous_date(db: Session, user_id: int, date: str):
+    """Most recent stored date before `date`, or None."""
+    row = db.query(BriefHistory.date).filter(
+        BriefHistory.user_id == user_id, BriefHistory.date < date
+    ).order_by(BriefHistory.date.desc()).first()
+    return row[0] if row else None
+
+def list_briefs(db: Session, user_id: int, limit: int = 30):
+    """Newest-first history metadata (payloads are not decoded)."""
+    rows = db.query(BriefHistory.date, BriefHistory.generated_at, BriefHistory.size).filter(
+        BriefHistory.user_id == user_id
+    ).order_by(BriefHistory.date.desc()).limit(limit)
+    return [{"date": d, "generated_at": g, "size": s} for d, g, s in rows]
+
+def get_fresh_brief(db: Session, user_id: int, max_age: timedelta):
+    """Returns today's stored brief if it is younger than `max_age`, else None."""
+    row = db.query(BriefHistory).filter(
+        BriefHistory.user_id == user_id,
+        BriefHistory.date == datetime.now().strftime("%Y-%m-%d")
+    ).first()
+    if not row or datetime.utcnow() - row.generated_at > max_age:
+        return None
+    return decode_brief(row.payload)
+
+def has_brief_since(db: Session, user_id: int, since_utc: datetime):
+    """True if the user already has today's brief generated at or after `since_utc`."""
+    return db.query(BriefHistory.id).filter(
+        BriefHistory.user_id == user_id,
+        BriefHistory.date == datetime.now().strftime("%Y-%m-%d"),
+        BriefHistory.generated_at >= since_utc
+    ).first() is not None
+
+def _section(brief, path):
+    value = brief
+    for part in path.split("."):
+        value = (value or {}).get(part)
+    return value or []
+
+def diff_briefs(old: dict, new: dict):
+    """
+    Item-level diff of the list sections in DIFF_SECTIONS plus the summary counts.
+    Items are matched by their id key; `changed` holds (old, new) pairs.
+    """
+    diff = {
+        "from": old.get("date"),
+        "to": new.get("date"),
+        "summary": {
+            k: {"from": old.get("summary", {}).get(k), "to": v}
+            for k, v in new.get("summary", {}).items()
+            if old.get("summary", {}).get(k) != v
+        },
+        "sections": {}
+    }
+    for path, key in DIFF_SECTIONS.items():
+        before = {item.get(key): item for item in _section(old, path)}
+        after = {item.get(key): item for item in _section(new, path)}
+        section = {
+            "added": [after[k] for k in after if k not in before],
+            "removed": [before[k] for k in before if k not in after],
+            "changed": [
+                {"from": before[k], "to": after[k]}
+                for k in after if k in before and before[k] != after[k]
+            ]
+        }
+        if any(section.values()):
+            diff["sections"][path] = section
+    return diff
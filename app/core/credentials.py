@@ -0,0 +1,165 @@
+import os
+import time
+import calendar
+import threading
+from datetime import datetime, timezone
+from app.core.database import SessionLocal
+from app.models.user import OAuthToken
+from app.core.user_cache import get_user, invalidate_user
+
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+SCOPES = ['https://www.googleapis.com/auth/gmail.readonly', 'https://www.googleapis.com/auth/calendar.readonly']
+
+# Tokens are refreshed this long before they expire: in the background for users
+# seen recently, or inline by get() as a fallback
+REFRESH_LEAD_SECONDS = int(os.getenv("CREDENTIAL_REFRESH_LEAD_SECONDS", "600"))
+REFRESH_INTERVAL = int(os.getenv("CREDENTIAL_REFRESH_INTERVAL", "60"))
+# Users not seen for this long are dropped from the cache and no longer refreshed
+IDLE_SECONDS = int(os.getenv("CREDENTIAL_IDLE_SECONDS", str(6 * 3600)))
+
+def _to_expiry(expires_at):
+    # google-auth compares expiry against naive UTC
+    if not expires_at:
+        return None
+    return datetime.fromtimestamp(expires_at, timezone.utc).replace(tzinfo=None)
+
+def _to_expires_at(expiry):
+    return calendar.timegm(expiry.utctimetuple()) if expiry else None
+
+class _Entry:
+    def __init__(self, creds):
+        self.creds = creds
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+class CredentialCache:
+    """
+    Per-user Google Credentials, reused across requests. Tokens are refreshed
+    ahead of `expires_at` (by a background thread for active users), refreshes
+    for the same user are collapsed into one, and refreshed tokens are written
+    back to oauth_tokens.
+    """
+    def __init__(self, lead_seconds=REFRESH_LEAD_SECONDS, interval=REFRESH_INTERVAL, idle_seconds=IDLE_SECONDS):
+        self.lead_seconds = lead_seconds
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self, user_id, db=None):
+        """Live Credentials for `user_id`, or None if the user has no stored token."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None:
+            creds = self._load(user_id, db)
+            if creds is None:
+                return None
+            with self._lock:
+                # Another request may have loaded it meanwhile: keep the first
+                entry = self._entries.setdefault(user_id, _Entry(creds))
+
+        entry.last_used = time.monotonic()
+        if self._needs_refresh(entry.creds):
+            self._refresh(user_id, entry)
+        return entry.creds
+
+    def invalidate(self, user_id):
+        """Forgets the cached credentials, e.g. after the user signs in again."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def _needs_refresh(self, creds, lead_seconds=None):
+        if not creds.refresh_token:
+            return False
+        if not creds.token or not creds.expiry:
+            return not creds.token
+        lead = self.lead_seconds if lead_seconds is None else lead_seconds
+        return (creds.expiry - datetime.utcnow()).total_seconds() < lead
+
+    def _load(self, user_id, db=None):
+        from google.oauth2.credentials import Credentials
+        try:
+            user = get_user(user_id, db)
+            token = user and user["token"]
+            if not token:
+                return None
+            return Credentials(
+                token=token["access_token"],
+                refresh_token=token["refresh_token"],
+                token_uri=TOKEN_URI,
+                client_id=os.getenv("GOOGLE_CLIENT_ID"),
+                client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
+                scopes=SCOPES,
+                expiry=_to_expiry(token["expires_at"])
+            )
+        except Exception as e:
+            print(f"[AUTH ERROR] Failed to reconstruct creds: {e}")
+            return None
+
+    def _refresh(self, user_id, entry, lead_seconds=None):
+        # One refresh per user at a time; callers that waited reuse its result
+        with entry.lock:
+            if not self._needs_refresh(entry.creds, lead_seconds):
+                return
+            from google.auth.transport.requests import Request as GoogleRequest
+            try:
+                entry.creds.refresh(GoogleRequest())
+            except Exception as e:
+                print(f"[WARN] Token refresh failed for User ID {user_id}: {e}")
+                return
+            self._save(user_id, entry.creds)
+
+    def _save(self, user_id, creds):
+        db = SessionLocal()
+        try:
+            token = db.query(OAuthToken).filter(OAuthToken.user_id == user_id).first()
+            if token:
+                token.access_token = creds.token
+                token.expires_at = _to_expires_at(creds.expiry)
+                # Google may rotate the refresh token
+                if creds.refresh_token:
+                    token.refresh_token = creds.refresh_token
+                db.commit()
+                invalidate_user(user_id)
+        except Exception as e:
+            db.rollback()
+            print(f"[WARN] Could not store refreshed token for User ID {user_id}: {e}")
+        finally:
+            db.close()
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, name="credential-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh_due()
+            except Exception as e:
+                print(f"[AUTH ERROR] Background refresh failed: {e}")
+
+    def refresh_due(self):
+        """Refreshes active users' tokens that expire within the lead time; drops idle users."""
+        now = time.monotonic()
+        with self._lock:
+            for user_id in [uid for uid, e in self._entries.items() if now - e.last_used > self.idle_seconds]:
+                del self._entries[user_id]
+            entries = list(self._entries.items())
+        # Run ahead of get()'s inline threshold so requests don't wait on a refresh
+        lead = self.lead_seconds + self.interval
+        for user_id, entry in entries:
+            if self._needs_refresh(entry.creds, lead):
+                self._refresh(user_id, entry, lead)
+
+credential_cache = CredentialCache()
+
+def get_google_creds(user_id, db=None):
+    """Cached, proactively refreshed Google credentials for `user_id` (None if not connected)."""
+    return credential_cache.get(user_id, db)
@@ -0,0 +1,19 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Dedicated pool for brief generation so multi-second briefs never run on the
+# event loop, and never starve the default threadpool used for sync routes.
+BRIEF_WORKERS = int(os.getenv("BRIEF_WORKERS", "4"))
+
+# Scheduled precomputes get their own small pool so user-facing briefs never queue behind them
+PRECOMPUTE_WORKERS = int(os.getenv("BRIEF_PRECOMPUTE_WORKERS", "2"))
+
+brief_executor = ThreadPoolExecutor(max_workers=BRIEF_WORKERS, thread_name_prefix="brief")
+precompute_executor = ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS, thread_name_prefix="brief-precompute")
+
+async def run_in_brief_executor(fn, *args, **kwargs):
+    """Runs a blocking callable on the brief pool and awaits its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(brief_executor, functools.partial(fn, *args, **kwargs))
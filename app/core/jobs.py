@@ -0,0 +1,126 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from app.core.executor import brief_executor
+
+# Finished jobs are kept (in memory, per process) for polling until evicted
+MAX_JOBS = 500
+
+# Brief keys carried by each source section
+SECTION_KEYS = {
+    "tasks": "priorities",
+    "schedule": "schedule",
+    "emails": "flagged_emails",
+    "metrics": "metrics",
+}
+
+def section_payload(name, data):
+    """Maps a source result onto the brief keys it fills in."""
+    if name == "meetings":
+        summaries, insights = data
+        return {"meeting_summaries": summaries, "meeting_insights": insights}
+    return {SECTION_KEYS.get(name, name): data}
+
+class BriefJob:
+    """
+    A brief being built in the background. Progress is an append-only list of
+    (event, data) tuples: "section" per completed source, then "done" or "failed".
+    """
+    def __init__(self, user_id):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.status = "queued"
+        self.created_at = time.time()
+        self.sections = {}
+        self.result = None
+        self.error = None
+        self._events = []
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def publish(self, event, data, status=None):
+        # Status changes land together with their event, so readers never see
+        # a finished job without its final event
+        with self._lock:
+            self._events.append((event, data))
+            if status:
+                self.status = status
+            listeners = list(self._listeners)
+        for notify in listeners:
+            notify()
+
+    def events_since(self, index):
+        """Returns (events after `index`, finished) as one consistent snapshot."""
+        with self._lock:
+            return self._events[index:], self.finished
+
+    def subscribe(self, notify):
+        """Registers a thread-safe wake-up callback; returns an unsubscribe function."""
+        with self._lock:
+            self._listeners.append(notify)
+
+        def unsubscribe():
+            with self._lock:
+                if notify in self._listeners:
+                    self._listeners.remove(notify)
+        return unsubscribe
+
+    def to_dict(self):
+        # Copied under the lock: the worker thread keeps adding sections
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "created_at": self.created_at,
+                "sections": dict(self.sections),
+                "result": self.result,
+                "error": self.error
+            }
+
+class JobManager:
+    """Queues brief jobs on the bounded brief executor and tracks their progress."""
+    def __init__(self, max_jobs=MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, user_id, work):
+        """
+        Queues `work(on_section)` and returns the job immediately. `work` must
+        return the finished brief dict.
+        """
+        job = BriefJob(user_id)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        brief_executor.submit(self._run, job, work)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, work):
+        job.status = "running"
+
+        def on_section(name, data):
+            payload = section_payload(name, data)
+            with job._lock:
+                job.sections.update(payload)
+            job.publish("section", {"name": name, "data": payload})
+
+        try:
+            job.result = work(on_section)
+            job.publish("done", job.result, status="done")
+        except Exception as e:
+            print(f"[JOB ERROR] Brief job {job.id} failed: {e}")
+            job.error = str(e)
+            job.publish("failed", {"error": job.error}, status="failed")
+
+jobs = JobManager()
@@ -0,0 +1,103 @@
+import os
+import threading
+import traceback
+from datetime import datetime, timedelta, timezone
+from app.core.database import SessionLocal
+from app.core.executor import precompute_executor
+from app.core.brief_store import save_brief, has_brief_since
+from app.models.user import User, OAuthToken
+
+# Briefs are precomputed in the LEAD minutes before MORNING_HOUR (server local time),
+# each user at a stable offset inside that window so the work is spread out.
+MORNING_HOUR = int(os.getenv("BRIEF_MORNING_HOUR", "8"))
+LEAD_MINUTES = int(os.getenv("BRIEF_PRECOMPUTE_LEAD_MINUTES", "90"))
+# Users are not precomputed once the morning window (MORNING_HOUR + 1h) has passed
+WINDOW_END_MINUTES = 60
+CHECK_INTERVAL = int(os.getenv("BRIEF_SCHEDULER_INTERVAL", "60"))
+
+class BriefScheduler:
+    """In-process scheduler that precomputes each registered user's morning brief."""
+    def __init__(self, interval=CHECK_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, name="brief-scheduler", daemon=True)
+        self._thread.start()
+        print(f"[SCHEDULER] Precomputing briefs from {LEAD_MINUTES} min before {MORNING_HOUR:02d}:00.")
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_due()
+            except Exception as e:
+                print(f"[SCHEDULER ERROR] {e}")
+
+    @staticmethod
+    def due_at(user_id, day):
+        """Local time at which `user_id`'s brief for `day` should be precomputed."""
+        window_start = datetime.combine(day, datetime.min.time()) + timedelta(hours=MORNING_HOUR, minutes=-LEAD_MINUTES)
+        # Knuth multiplicative hash: stable, evenly spread offset per user
+        offset = (user_id * 2654435761) % max(LEAD_MINUTES, 1)
+        return window_start + timedelta(minutes=offset)
+
+    def run_due(self, now=None):
+        """Queues a precompute for every user whose slot has arrived and who has no brief since."""
+        now = now or datetime.now()
+        window_end = datetime.combine(now.date(), datetime.min.time()) + timedelta(hours=MORNING_HOUR, minutes=WINDOW_END_MINUTES)
+        if now >= window_end:
+            return []
+
+        db = SessionLocal()
+        try:
+            user_ids = [
+                uid for (uid,) in db.query(User.id).join(OAuthToken, OAuthToken.user_id == User.id)
+            ]
+            queued = []
+            for user_id in user_ids:
+                due = self.due_at(user_id, now.date())
+                if now < due:
+                    continue
+                due_utc = due.astimezone(timezone.utc).replace(tzinfo=None)
+                if has_brief_since(db, user_id, due_utc):
+                    continue
+                with self._lock:
+                    if user_id in self._in_flight:
+                        continue
+                    self._in_flight.add(user_id)
+                precompute_executor.submit(self._precompute, user_id)
+                queued.append(user_id)
+            return queued
+        finally:
+            db.close()
+
+    def _precompute(self, user_id):
+        # Imported here so the scheduler module stays cheap to import
+        from app.core.credentials import get_google_creds
+        from tools.navigation import generate_daily_brief
+        from tools.utils.notion_gateway import PRIORITY_BACKGROUND
+
+        db = SessionLocal()
+        try:
+            print(f"[SCHEDULER] Precomputing brief for User ID {user_id}...")
+            creds = get_google_creds(user_id, db)
+            # Background priority: interactive briefs go first at the Notion rate limiter
+            brief, slack_payload = generate_daily_brief(creds=creds, user_id=user_id, priority=PRIORITY_BACKGROUND)
+            save_brief(db, user_id, brief)
+        except Exception as e:
+            print(f"[SCHEDULER ERROR] Brief for User ID {user_id} failed: {e}")
+            traceback.print_exc()
+        finally:
+            db.close()
+            with self._lock:
+                self._in_flight.discard(user_id)
+
+scheduler = BriefScheduler()
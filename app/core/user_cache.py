@@ -0,0 +1,56 @@
+import os
+import time
+from sqlalchemy.orm import joinedload
+from app.core.database import SessionLocal
+from app.models.user import User
+from tools.utils.cache import MemoryBackend
+
+# Seconds a cached user/token row is served before it is read again
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+
+USER_FIELDS = ("id", "email", "name", "avatar_url", "created_at")
+TOKEN_FIELDS = ("access_token", "refresh_token", "expires_at")
+
+_users = MemoryBackend(max_entries=USER_CACHE_MAX_ENTRIES)
+
+def _snapshot(user):
+    # Plain dicts, so cached rows outlive the session that loaded them
+    data = {field: getattr(user, field) for field in USER_FIELDS}
+    token = user.token
+    data["token"] = {field: getattr(token, field) for field in TOKEN_FIELDS} if token else None
+    return data
+
+def get_user(user_id, db=None):
+    """
+    Read-through cache of a user row and its OAuth token, as
+    {"id", "email", "name", "avatar_url", "created_at", "token": {...} or None}.
+    Returns None for unknown users (misses are not cached).
+    """
+    if not user_id:
+        return None
+    entry = _users.get(user_id)
+    if entry is not None and time.monotonic() - entry[1] < USER_CACHE_TTL:
+        return entry[0]
+
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        user = db.query(User).options(joinedload(User.token)).filter(User.id == user_id).first()
+        if not user:
+            _users.delete(user_id)
+            return None
+        data = _snapshot(user)
+    finally:
+        if own_session:
+            db.close()
+    _users.set(user_id, data, time.monotonic())
+    return data
+
+def public_user(data):
+    """The user fields safe to return to the browser (no token)."""
+    return {field: data[field] for field in USER_FIELDS}
+
+def invalidate_user(user_id):
+    """Drops the cached rows after the user or their token is written."""
+    _users.delete(user_id)
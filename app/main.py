@@ -1,5 +1,6 @@
 import os
 import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,13 +9,26 @@ from starlette.middleware.sessions import SessionMiddleware
 # Ensure root directory is in python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app.api import run_brief, auth
-from app.core.database import engine, Base
+from app.api import run_brief, brief_jobs, briefs, auth
+from app.core.database import init_db
+from app.core.scheduler import scheduler
+from app.core.credentials import credential_cache
 
 # Create Database Tables
-Base.metadata.create_all(bind=engine)
+init_db()
 
-app = FastAPI(title="Aevel HQ")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Precompute morning briefs in the background (set BRIEF_SCHEDULER=0 to disable)
+    if os.getenv("BRIEF_SCHEDULER", "1") != "0":
+        scheduler.start()
+    # Keeps signed-in users' Google tokens fresh ahead of expiry
+    credential_cache.start()
+    yield
+    scheduler.stop()
+    credential_cache.stop()
+
+app = FastAPI(title="Aevel HQ", lifespan=lifespan)
 
 # CORS (Allow all for local dev)
 app.add_middleware(
@@ -31,6 +45,8 @@ app.add_middleware(SessionMiddleware, secret_key=os.getenv("SECRET_KEY", "dev_se
 
 # API Routes
 app.include_router(run_brief.router, prefix="/api")
+app.include_router(brief_jobs.router, prefix="/api")
+app.include_router(briefs.router, prefix="/api")
 app.include_router(auth.router, prefix="/auth")
 
 # Static Files (Frontend)
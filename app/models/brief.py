@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+class BriefHistory(Base):
+    """One generated brief per user and day (precomputed or on demand), stored compressed."""
+    __tablename__ = "brief_history"
+    __table_args__ = (UniqueConstraint("user_id", "date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    date = Column(String, index=True) # YYYY-MM-DD, as in the brief payload
+
+    payload = Column(LargeBinary) # zlib-compressed compact JSON (see app/core/brief_store.py)
+    size = Column(Integer) # Uncompressed JSON bytes
+    generated_at = Column(DateTime, default=datetime.utcnow)
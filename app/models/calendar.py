@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from app.core.database import Base
+
+class CalendarEvent(Base):
+    """Local copy of a user's primary calendar, kept current with Calendar syncTokens."""
+    __tablename__ = "calendar_events"
+    __table_args__ = (UniqueConstraint("user_id", "event_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    event_id = Column(String)
+
+    summary = Column(String)
+    start = Column(String) # Raw dateTime/date from the API
+    end = Column(String)
+    start_at = Column(DateTime, index=True) # UTC, for range queries
+    end_at = Column(DateTime)
+    link = Column(String)
+    organizer = Column(String)
+
+    def to_dict(self):
+        return {
+            "event_id": self.event_id,
+            "summary": self.summary,
+            "start": self.start,
+            "end": self.end,
+            "link": self.link,
+            "organizer": self.organizer
+        }
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+from app.core.database import Base
+
+class NotionTask(Base):
+    """Local mirror of the Notion task database used by TaskRanker."""
+    __tablename__ = "notion_tasks"
+    __table_args__ = (UniqueConstraint("database_id", "task_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    database_id = Column(String, index=True)
+    task_id = Column(String)
+
+    title = Column(String)
+    status = Column(String, index=True)
+    priority = Column(String)
+    due_date = Column(String) # ISO date/datetime as returned by Notion
+    url = Column(String)
+    last_edited_time = Column(String) # ISO timestamp, drives the incremental cursor
+
+    def to_dict(self):
+        return {
+            "task_id": self.task_id,
+            "title": self.title,
+            "status": self.status,
+            "priority": self.priority,
+            "due_date": self.due_date,
+            "url": self.url
+        }
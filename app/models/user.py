@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -17,6 +17,8 @@ class User(Base):
 
 class OAuthToken(Base):
     __tablename__ = "oauth_tokens"
+    # One token per user; also the conflict target of the login upsert
+    __table_args__ = (Index("uq_oauth_tokens_user_id", "user_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -26,3 +28,30 @@ class OAuthToken(Base):
     expires_at = Column(Integer) # Unix timestamp
     
     user = relationship("User", back_populates="token")
+
+class SyncState(Base):
+    """Incremental sync cursor per user and source (e.g. Gmail historyId)."""
+    __tablename__ = "sync_states"
+    __table_args__ = (UniqueConstraint("user_id", "source"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True) # NULL for shared sources
+    source = Column(String) # e.g. "gmail", "notion_tasks:<database_id>"
+
+    cursor = Column(String) # Opaque upstream token (historyId, syncToken, ...)
+    full_synced_at = Column(DateTime) # Last full (non-incremental) sync
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class FlaggedEmail(Base):
+    """Local cache of starred message metadata, kept current by Gmail history sync."""
+    __tablename__ = "flagged_emails"
+    __table_args__ = (UniqueConstraint("user_id", "message_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    message_id = Column(String)
+
+    subject = Column(String)
+    sender = Column(String)
+    snippet = Column(String)
+    internal_date = Column(BigInteger) # Epoch ms, used for newest-first ordering
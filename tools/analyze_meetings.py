@@ -1,11 +1,21 @@
 import os
 import sys
 import json
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.fetch_meeting_content import MeetingContentFetcher
+from tools.utils.config import Config
+from tools.utils.cache import MemoryBackend
+
+# Analyses keyed by (page id, last_edited_time): a note is only re-read after it is
+# edited. Entries expire so a transient fetch failure is not kept all day.
+ANALYSIS_TTL = 3600
+_analyses = MemoryBackend(max_entries=256)
 
 class MeetingAnalyzer:
     def __init__(self):
@@ -22,8 +32,57 @@ class MeetingAnalyzer:
 
     def analyze_meeting(self, meeting_id, title="Untitled", date="Unknown"):
         print(f"Analyzing meeting: {title}...")
-        blocks = self.fetcher.fetch_blocks(meeting_id)
-        
+        # Parsing consumes the block stream as Notion returns it
+        blocks = self.fetcher.iter_blocks(meeting_id)
+        return self.parse_blocks(blocks, meeting_id, title=title, date=date)
+
+    def analyze_many(self, meetings, max_workers=None):
+        """
+        Analyzes a batch of meetings ({"id", "title", "date", "last_edited_time"} dicts)
+        in parallel. Concurrency is capped (default: Config.NOTION_MAX_CONCURRENCY) to stay
+        within Notion's rate limit. Results are returned in input order.
+        """
+        if not meetings:
+            return []
+
+        # Unedited meetings reuse their previous analysis
+        now = time.time()
+        results = [None] * len(meetings)
+        stale = []
+        for index, m in enumerate(meetings):
+            edited = m.get("last_edited_time")
+            entry = _analyses.get((m["id"], edited)) if edited else None
+            if entry is not None and now - entry[1] < ANALYSIS_TTL:
+                results[index] = entry[0]
+            else:
+                stale.append(index)
+        if not stale:
+            print(f"Reusing analysis for {len(meetings)} unchanged meetings.")
+            return results
+
+        max_workers = max_workers or Config.NOTION_MAX_CONCURRENCY
+        workers = min(max_workers, len(stale))
+        print(f"Analyzing {len(stale)} of {len(meetings)} meetings ({workers} at a time)...")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="meeting-analyzer") as pool:
+            # Each worker runs in a copy of the caller's context (keeps the Notion priority)
+            futures = {
+                index: pool.submit(
+                    contextvars.copy_context().run, self.analyze_meeting,
+                    meetings[index]["id"], title=meetings[index].get("title", "Untitled"),
+                    date=meetings[index].get("date", "Unknown")
+                )
+                for index in stale
+            }
+            for index, future in futures.items():
+                results[index] = future.result()
+                edited = meetings[index].get("last_edited_time")
+                if edited:
+                    _analyses.set((meetings[index]["id"], edited), results[index], now)
+            return results
+
+    def parse_blocks(self, blocks, meeting_id, title="Untitled", date="Unknown"):
+        """Extracts decisions and action items from a meeting's blocks (any iterable, in document order)."""
         analysis = {
             "meeting_id": meeting_id,
             "title": title,
@@ -1,7 +1,8 @@
 import os
 import sys
 import json
-from datetime import datetime, timedelta
+import heapq
+from datetime import datetime, timedelta, timezone
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -9,44 +10,93 @@ from tools.fetch_calendar import CalendarFetcher
 from tools.fetch_notion import NotionFetcher
 
 class ScheduleAnalyzer:
-    def __init__(self, creds=None):
-        self.cal_fetcher = CalendarFetcher(creds=creds)
+    def __init__(self, creds=None, user_id=None, horizon_days=1):
+        self.cal_fetcher = CalendarFetcher(creds=creds, user_id=user_id)
         self.notion_fetcher = NotionFetcher()
+        # Window analyzed when events are served from the local store (uncapped)
+        self.horizon_days = horizon_days
 
-    def _parse_iso(self, iso_str):
-        # Handle 'Z' or offset if needed, basic implementation
+    @staticmethod
+    def _parse_iso(iso_str):
+        # Handle 'Z' or offset. All-day dates (no time part) return None: they span
+        # the whole day and would "overlap" every meeting, so they are not compared.
+        if "T" not in iso_str:
+            return None
         try:
-            return datetime.fromisoformat(iso_str.replace('Z', '+00:00'))
+            dt = datetime.fromisoformat(iso_str.replace('Z', '+00:00'))
         except:
             return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+
+    @staticmethod
+    def detect_conflicts(events):
+        """
+        Sweep-line overlap detection: each event is parsed once, events are sorted
+        by start, and a min-heap of end times holds the events still running.
+        Returns (conflicts, groups): every overlapping pair, plus each maximal
+        group of transitively overlapping events. All-day events are skipped.
+        O(n log n + pairs).
+        """
+        parsed = []
+        for ev in events:
+            start = ScheduleAnalyzer._parse_iso(ev['start'])
+            end = ScheduleAnalyzer._parse_iso(ev['end'])
+            if start and end:
+                parsed.append((start, end, ev))
+        parsed.sort(key=lambda item: item[0])
+
+        conflicts = []
+        groups = []
+        active = [] # heap of (end, order, event)
+        group = []
+        group_start = group_end = None
+
+        for order, (start, end, ev) in enumerate(parsed):
+            # Overlap logic: StartA < EndB AND StartB < EndA
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, _, other in active:
+                conflicts.append({
+                    "event_a": other["summary"],
+                    "event_b": ev["summary"],
+                    "reason": f"Overlap: {other['summary']} overlaps with {ev['summary']}"
+                })
+            heapq.heappush(active, (end, order, ev))
+
+            if group and start < group_end:
+                group.append(ev)
+                group_end = max(group_end, end)
+            else:
+                if len(group) > 1:
+                    groups.append(ScheduleAnalyzer._to_group(group, group_start, group_end))
+                group = [ev]
+                group_start, group_end = start, end
+
+        if len(group) > 1:
+            groups.append(ScheduleAnalyzer._to_group(group, group_start, group_end))
+
+        return conflicts, groups
+
+    @staticmethod
+    def _to_group(group, start, end):
+        return {
+            "event_ids": [ev["event_id"] for ev in group],
+            "summaries": [ev["summary"] for ev in group],
+            "start": start.isoformat(),
+            "end": end.isoformat()
+        }
 
     def analyze_schedule(self):
         print("Analyzing Schedule...")
-        events = self.cal_fetcher.fetch_upcoming_events(limit=10)
+        if self.cal_fetcher.user_id:
+            events = self.cal_fetcher.fetch_upcoming_events(limit=None, days=self.horizon_days)
+        else:
+            events = self.cal_fetcher.fetch_upcoming_events(limit=10)
         
         # 1. Conflict Detection
-        conflicts = []
-        for i in range(len(events)):
-            for j in range(i + 1, len(events)):
-                ev1 = events[i]
-                ev2 = events[j]
-                
-                # Parse ISO strings to datetime objects
-                start1 = self._parse_iso(ev1['start'])
-                end1 = self._parse_iso(ev1['end'])
-                start2 = self._parse_iso(ev2['start'])
-                end2 = self._parse_iso(ev2['end'])
-                
-                if not (start1 and end1 and start2 and end2):
-                    continue
-
-                # Overlap logic: StartA < EndB AND StartB < EndA
-                if start1 < end2 and start2 < end1:
-                    conflicts.append({
-                        "event_a": ev1["summary"],
-                        "event_b": ev2["summary"],
-                        "reason": f"Overlap: {ev1['summary']} overlaps with {ev2['summary']}"
-                    })
+        conflicts, conflict_groups = self.detect_conflicts(events)
 
         # 2. Priority Tagging
         high_priority = []
@@ -80,7 +130,8 @@ class ScheduleAnalyzer:
         return {
             "events": formatted_events,
             "analysis": {
-                "conflicts": conflicts, # Placeholder until fetcher improves
+                "conflicts": conflicts,
+                "conflict_groups": conflict_groups, # Transitively overlapping blocks
                 "high_priority_ids": high_priority,
                 "total_events": len(events)
             }
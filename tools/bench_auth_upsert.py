@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Point the app at a throwaway database before it creates its engine
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp.name, 'bench_auth.db')}")
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core.database import SessionLocal, init_db, SQLALCHEMY_DATABASE_URL
+from app.models.user import User, OAuthToken
+from app.api.auth import upsert_login
+
+def legacy_login(db, user_info, token):
+    """The previous auth_callback: SELECT user, commit, SELECT token, commit."""
+    user = db.query(User).filter(User.email == user_info['email']).first()
+    if not user:
+        user = User(email=user_info['email'], name=user_info.get('name'), avatar_url=user_info.get('picture'))
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    else:
+        user.name = user_info.get('name')
+        user.avatar_url = user_info.get('picture')
+        db.commit()
+
+    oauth_token = db.query(OAuthToken).filter(OAuthToken.user_id == user.id).first()
+    if not oauth_token:
+        oauth_token = OAuthToken(user_id=user.id)
+        db.add(oauth_token)
+    oauth_token.access_token = token.get('access_token')
+    oauth_token.refresh_token = token.get('refresh_token')
+    oauth_token.expires_at = token.get('expires_at')
+    db.commit()
+    return user.id
+
+def make_logins(count, users, tag):
+    # A morning rush: `users` people, most of them signing in more than once
+    return [
+        ({"email": f"{tag}{i % users}@example.com", "name": f"User {i % users}", "picture": None},
+         {"access_token": f"at-{i}", "refresh_token": f"rt-{i}" if i < users else None, "expires_at": int(time.time()) + 3600})
+        for i in range(count)
+    ]
+
+def run_logins(login, logins, workers):
+    """Returns (elapsed seconds, {error type: count}) for the failed logins."""
+    def one(args):
+        db = SessionLocal()
+        try:
+            login(db, *args)
+            return None
+        except Exception as e:
+            # e.g. concurrent first logins racing on users.email: a failed sign-in
+            db.rollback()
+            return type(getattr(e, "orig", None) or e).__name__
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        errors = [error for error in pool.map(one, logins) if error]
+    return time.perf_counter() - start, Counter(errors)
+
+def check(tag, users):
+    db = SessionLocal()
+    try:
+        user_count = db.query(User).filter(User.email.like(f"{tag}%")).count()
+        token_count = db.query(OAuthToken).join(User).filter(User.email.like(f"{tag}%")).count()
+        kept = db.query(OAuthToken).join(User).filter(User.email.like(f"{tag}%"), OAuthToken.refresh_token.isnot(None)).count()
+        return f"{user_count}/{users} users, {token_count} tokens, {kept} refresh tokens kept"
+    finally:
+        db.close()
+
+def run(logins, users, workers):
+    init_db()
+    print(f"--- Auth callback writes: {logins} logins by {users} users, {workers} threads ({SQLALCHEMY_DATABASE_URL.split(':')[0]}) ---")
+    for label, login, tag in (("legacy (3 commits)", legacy_login, "legacy"), ("upsert (1 transaction)", upsert_login, "upsert")):
+        elapsed, errors = run_logins(login, make_logins(logins, users, tag), workers)
+        failed = sum(errors.values())
+        detail = f" ({', '.join(f'{name} x{count}' for name, count in errors.items())})" if failed else ""
+        print(f"  {label:<24} {logins / elapsed:8.0f} logins/s  ({elapsed:.2f}s)  "
+              f"{failed} failed{detail}  {check(tag, users)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the auth callback's user/token writes.")
+    parser.add_argument("--logins", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run(args.logins, args.users, args.workers)
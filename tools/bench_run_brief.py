@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+import httpx
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.main import app
+import app.api.run_brief as run_brief_api
+import tools.navigation as navigation
+from app.core.executor import BRIEF_WORKERS
+
+def make_stub(seconds):
+    """Stands in for generate_daily_brief: blocks its thread like real upstream I/O."""
+    def stub_brief(creds=None, user_id=None, **kwargs):
+        time.sleep(seconds)
+        return {"date": "bench", "priorities": []}, {"blocks": []}
+    return stub_brief
+
+async def run_inline(fn, *args, **kwargs):
+    # Previous behaviour: the blocking brief ran directly on the event loop
+    return fn(*args, **kwargs)
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+async def load_test(briefs, probes, brief_seconds):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def brief():
+            start = time.perf_counter()
+            response = await client.post("/api/run-brief")
+            assert response.status_code == 200, response.text
+            return time.perf_counter() - start
+
+        async def probe(i):
+            # Spread static-file requests across the brief window
+            await asyncio.sleep(i * brief_seconds / max(probes, 1))
+            start = time.perf_counter()
+            response = await client.get("/login.html")
+            assert response.status_code == 200
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        brief_times, probe_times = await asyncio.gather(
+            asyncio.gather(*[brief() for _ in range(briefs)]),
+            asyncio.gather(*[probe(i) for i in range(probes)])
+        )
+        return time.perf_counter() - start, brief_times, probe_times
+
+def report(label, wall, brief_times, probe_times):
+    print(f"\n[{label}]")
+    print(f"  wall time:          {wall:.2f}s")
+    print(f"  brief throughput:   {len(brief_times) / wall:.2f} briefs/s")
+    print(f"  brief latency:      p50 {statistics.median(brief_times):.2f}s  max {max(brief_times):.2f}s")
+    print(f"  static latency:     p50 {statistics.median(probe_times) * 1000:.1f}ms  "
+          f"p95 {_pct(probe_times, 0.95) * 1000:.1f}ms  max {max(probe_times) * 1000:.1f}ms")
+
+def run(briefs, probes, brief_seconds):
+    navigation.generate_daily_brief = make_stub(brief_seconds)
+    print(f"--- /api/run-brief load test: {briefs} concurrent briefs ({brief_seconds}s each), "
+          f"{probes} static requests, {BRIEF_WORKERS} brief workers ---")
+
+    offloaded = run_brief_api.run_in_brief_executor
+    run_brief_api.run_in_brief_executor = run_inline
+    report("blocking (on event loop)", *asyncio.run(load_test(briefs, probes, brief_seconds)))
+
+    run_brief_api.run_in_brief_executor = offloaded
+    report("brief executor", *asyncio.run(load_test(briefs, probes, brief_seconds)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test /api/run-brief with a stubbed brief generator.")
+    parser.add_argument("--briefs", type=int, default=8)
+    parser.add_argument("--probes", type=int, default=40)
+    parser.add_argument("--brief-seconds", type=float, default=0.5)
+    args = parser.parse_args()
+    run(args.briefs, args.probes, args.brief_seconds)
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from tools.analyze_schedule import ScheduleAnalyzer
+
+def make_events(n, days=21, calendars=4, seed=7):
+    """Synthetic multi-week, multi-calendar horizon (mixed offsets, some all-day)."""
+    rng = random.Random(seed)
+    base = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    offsets = [timezone.utc, timezone(timedelta(hours=-5)), timezone(timedelta(hours=1)), timezone(timedelta(hours=9))]
+    events = []
+    for i in range(n):
+        if rng.random() < 0.03:
+            day = (base + timedelta(days=rng.randrange(days))).date()
+            start, end = day.isoformat(), (day + timedelta(days=1)).isoformat()
+        else:
+            tz = offsets[i % calendars % len(offsets)]
+            start_dt = base + timedelta(days=rng.randrange(days), hours=rng.randrange(7, 19), minutes=rng.choice([0, 15, 30, 45]))
+            end_dt = start_dt + timedelta(minutes=rng.choice([15, 30, 45, 60, 90]))
+            start, end = start_dt.astimezone(tz).isoformat(), end_dt.astimezone(tz).isoformat()
+        events.append({"event_id": f"ev{i}", "summary": f"Event {i}", "start": start, "end": end})
+    return events
+
+def legacy_conflicts(events):
+    """The previous O(n^2) pairwise loop, re-parsing timestamps in the inner loop."""
+    conflicts = []
+    for i in range(len(events)):
+        for j in range(i + 1, len(events)):
+            ev1 = events[i]
+            ev2 = events[j]
+
+            start1 = ScheduleAnalyzer._parse_iso(ev1['start'])
+            end1 = ScheduleAnalyzer._parse_iso(ev1['end'])
+            start2 = ScheduleAnalyzer._parse_iso(ev2['start'])
+            end2 = ScheduleAnalyzer._parse_iso(ev2['end'])
+
+            if not (start1 and end1 and start2 and end2):
+                continue
+
+            if start1 < end2 and start2 < end1:
+                conflicts.append({"event_a": ev1["summary"], "event_b": ev2["summary"]})
+    return conflicts
+
+def _pair_set(conflicts):
+    return {frozenset((c["event_a"], c["event_b"])) for c in conflicts}
+
+def run(sizes, legacy_max):
+    print(f"{'events':>8} {'legacy (s)':>12} {'sweep (s)':>12} {'speedup':>9} {'pairs':>8} {'groups':>7}")
+    for n in sizes:
+        events = make_events(n)
+
+        t0 = time.perf_counter()
+        conflicts, groups = ScheduleAnalyzer.detect_conflicts(events)
+        sweep_s = time.perf_counter() - t0
+
+        legacy_s = None
+        if n <= legacy_max:
+            t0 = time.perf_counter()
+            expected = legacy_conflicts(events)
+            legacy_s = time.perf_counter() - t0
+            assert _pair_set(expected) == _pair_set(conflicts), "sweep-line result differs from legacy loop"
+
+        legacy_str = f"{legacy_s:12.4f}" if legacy_s is not None else f"{'skipped':>12}"
+        speedup = f"{legacy_s / sweep_s:8.1f}x" if legacy_s is not None else f"{'-':>9}"
+        print(f"{n:>8} {legacy_str} {sweep_s:12.4f} {speedup} {len(conflicts):>8} {len(groups):>7}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark schedule conflict detection (legacy pairwise vs sweep-line).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000, 2000, 5000, 20000])
+    parser.add_argument("--legacy-max", type=int, default=2000, help="Skip the O(n^2) loop above this size.")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_max)
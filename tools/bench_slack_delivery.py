@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+import requests
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from tools.deliver_slack import SlackDelivery
+from tools.utils.slack_stub import StubWebhookServer
+
+def make_payload(blocks):
+    return {"text": "Daily Executive Brief", "blocks": [
+        {"type": "divider"} if i % 6 == 0 else {"type": "section", "text": {"type": "mrkdwn", "text": f"Line {i}"}}
+        for i in range(blocks)
+    ]}
+
+def legacy_send(deliveries):
+    """The previous send_to_slack: one bare requests.post per delivery, in sequence."""
+    for url, payload in deliveries:
+        requests.post(url, json=payload)
+
+def run(destinations, latency, workers):
+    payload = make_payload(20)
+    with StubWebhookServer(latency=latency) as stub:
+        deliveries = [(f"{stub.url}/{i}", payload) for i in range(destinations)]
+        print(f"--- Slack fan-out: {destinations} webhooks, {latency * 1000:.0f}ms stub latency ---")
+
+        start = time.perf_counter()
+        legacy_send(deliveries)
+        legacy = time.perf_counter() - start
+        print(f"  legacy (sequential requests.post):   {legacy:.2f}s")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            delivery = SlackDelivery(max_concurrency=workers, log_path=os.path.join(tmp, "log.jsonl"))
+            start = time.perf_counter()
+            results = delivery.deliver_many(deliveries)
+            pooled = time.perf_counter() - start
+            print(f"  SlackDelivery ({workers} workers, pooled):  {pooled:.2f}s  "
+                  f"({legacy / pooled:.1f}x, {sum(r['ok'] for r in results)}/{destinations} ok)")
+
+    # Behaviour checks: retries honour Retry-After, oversized payloads are split
+    with StubWebhookServer(script=[(429, {"Retry-After": "0.2"}), 503]) as stub, tempfile.TemporaryDirectory() as tmp:
+        delivery = SlackDelivery(log_path=os.path.join(tmp, "log.jsonl"))
+        result = delivery.deliver(stub.url, make_payload(120))
+        sizes = [len(p["blocks"]) for _, p in stub.received]
+        print(f"  retry + split: ok={result['ok']} attempts={result['attempts']} messages={sizes}")
+        with open(os.path.join(tmp, "log.jsonl")) as f:
+            print(f"  delivery log: {f.read().strip()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Slack delivery fan-out against a local stub webhook.")
+    parser.add_argument("--destinations", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run(args.destinations, args.latency, args.workers)
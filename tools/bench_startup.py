@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules that should only load when a brief is actually built
+HEAVY_MODULES = ("tools.navigation", "pandas", "numpy", "notion_client", "googleapiclient", "google_auth_oauthlib")
+
+def _python(code, *flags):
+    env = dict(os.environ, PYTHONPATH=ROOT, BRIEF_SCHEDULER="0")
+    # Run elsewhere so init_db's relative sqlite file doesn't land in the repo
+    with tempfile.TemporaryDirectory() as cwd:
+        return subprocess.run(
+            [sys.executable, *flags, "-c", code],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True
+        )
+
+def wall_times(module, runs):
+    """Cold `import module` in fresh interpreters, minus bare interpreter startup."""
+    def measure(code):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            _python(code)
+            times.append(time.perf_counter() - start)
+        return statistics.median(times)
+    return measure(f"import {module}") - measure("pass"), measure("pass")
+
+def import_profile(module, top):
+    """Parses `python -X importtime` into (cumulative us, module) for top-level imports."""
+    stderr = _python(f"import {module}", "-X", "importtime").stderr
+    rows, loaded = [], set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[12:]:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        cumulative = cumulative.strip()
+        if not cumulative.isdigit():
+            continue
+        loaded.add(name.strip())
+        # Direct children of the measured module are indented by two spaces
+        depth = len(name) - len(name.lstrip()) - 1
+        if depth == 2:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top], loaded
+
+def run(module, runs, top):
+    print(f"--- Cold start: import {module} ({runs} runs) ---")
+    elapsed, baseline = wall_times(module, runs)
+    print(f"  import time (median):      {elapsed * 1000:.0f}ms  (interpreter startup {baseline * 1000:.0f}ms excluded)")
+
+    rows, loaded = import_profile(module, top)
+    print(f"  slowest direct imports (-X importtime, cumulative):")
+    for cumulative, name in rows:
+        print(f"    {cumulative / 1000:8.1f}ms  {name}")
+    eager = [name for name in HEAVY_MODULES if name in loaded]
+    print(f"  heavy modules loaded at startup: {', '.join(eager) or 'none'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold import time of the web app.")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+    run(args.module, args.runs, args.top)
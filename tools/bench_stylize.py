@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import tools.stylize as stylize
+from tools.stylize import BriefStylizer
+from tools.utils.cache import MemoryBackend
+
+def make_brief(user, rng, shared):
+    """Synthetic brief: team sections come from `shared`, schedule and emails are per user."""
+    day = datetime(2026, 3, 2, 8, tzinfo=timezone.utc)
+    events = []
+    for i in range(rng.randrange(3, 12)):
+        start = day + timedelta(minutes=30 * rng.randrange(0, 20))
+        events.append({
+            "event_id": f"u{user}-ev{i}",
+            "summary": f"Sync #{i} with <Team {rng.randrange(9)}> & partners",
+            "start": start.isoformat(),
+            "end": (start + timedelta(minutes=30)).isoformat(),
+            "link": f"https://calendar.google.com/event?eid=u{user}e{i}",
+            "tags": ["High Priority"] if rng.random() < 0.2 else []
+        })
+    return {
+        "date": "2026-03-02",
+        "generated_at": datetime.now().isoformat(),
+        "summary": {"task_count": len(shared["priorities"]), "meeting_count": len(events), "urgent_email_count": 3},
+        "priorities": shared["priorities"],
+        "meeting_insights": shared["meeting_insights"],
+        "metrics": shared["metrics"],
+        "schedule": {
+            "events": events,
+            "analysis": {"conflicts": [{"reason": f"Overlap: Sync #0 & Sync #{len(events) - 1}"}]}
+        },
+        "flagged_emails": [
+            {"id": f"u{user}-m{i}", "subject": f"Re: Q{i} numbers <draft>", "sender": f"Person {i} <p{i}@example.com>"}
+            for i in range(3)
+        ],
+    }
+
+def make_shared(rng):
+    return {
+        "priorities": [
+            {"task_id": f"t{i}", "title": f"Task {i} & follow-up", "status": rng.choice(["Not started", "In progress"]),
+             "priority": rng.choice(["High", "Medium", "Low"]), "score": rng.randrange(10, 99),
+             "url": f"https://notion.so/t{i}"}
+            for i in range(5)
+        ],
+        "meeting_insights": [
+            {"meeting_id": f"m{i}", "title": f"Weekly {i}",
+             "analysis": {"decisions": [f"Ship v{i}"], "action_items": [{"task": f"Write spec {i}", "status": "Open"}]}}
+            for i in range(3)
+        ],
+        "metrics": [{"metric": f"KPI {i}", "value": rng.randrange(1000)} for i in range(6)],
+    }
+
+def run_batch(briefs, mode):
+    # A fresh fragment cache per run; "no reuse" disables it entirely
+    stylize._fragments = MemoryBackend(max_entries=0 if mode == "no reuse" else 512)
+    start = time.perf_counter()
+    if mode == "render_many":
+        BriefStylizer.render_many(briefs)
+    else:
+        for brief in briefs:
+            BriefStylizer.render(brief)
+    return time.perf_counter() - start
+
+def run(users, teams, seed=7):
+    rng = random.Random(seed)
+    shared = [make_shared(rng) for _ in range(teams)]
+    briefs = [make_brief(u, rng, shared[u % teams]) for u in range(users)]
+    print(f"--- BriefStylizer: {users} briefs (Slack + HTML), {teams} team(s) ---")
+
+    for mode in ("no reuse", "fragment reuse", "render_many"):
+        elapsed = run_batch(briefs, mode)
+        print(f"  {mode:<15} {elapsed:.2f}s  {users / elapsed * 60:>9,.0f} briefs/min  "
+              f"{elapsed / users * 1000:.2f}ms/brief")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark brief rendering throughput in batch-sending mode.")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--teams", type=int, default=4, help="Distinct shared task/meeting/KPI sets")
+    args = parser.parse_args()
+    run(args.users, args.teams)
@@ -1,10 +1,10 @@
 import os
 import sys
-from notion_client import Client
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.utils.config import Config
+from tools.utils.notion_gateway import get_notion_client
 
 def list_accessible_objects():
     print("--- NOTION DEBUGGER ---")
@@ -13,7 +13,7 @@ def list_accessible_objects():
         print("[ERROR] No API Key found.")
         return
 
-    client = Client(auth=Config.NOTION_API_KEY)
+    client = get_notion_client()
     
     try:
         # Search for *everything* this bot can see
@@ -0,0 +1,162 @@
+import os
+import sys
+import json
+import time
+import random
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from tools.utils.config import Config
+
+# Slack rejects messages with more than 50 blocks
+MAX_BLOCKS = 50
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_BACKOFF = 30
+
+def split_blocks(payload, limit=MAX_BLOCKS):
+    """
+    Splits a Block Kit payload into messages of at most `limit` blocks. Splits
+    prefer a section boundary (before a divider or header) in the second half
+    of the window. Other top-level keys (e.g. the `text` fallback) go on every message.
+    """
+    blocks = payload.get("blocks", [])
+    if len(blocks) <= limit:
+        return [payload]
+
+    rest = {key: value for key, value in payload.items() if key != "blocks"}
+    messages = []
+    start = 0
+    while start < len(blocks):
+        end = min(start + limit, len(blocks))
+        if end < len(blocks):
+            for cut in range(end, start + limit // 2, -1):
+                if blocks[cut].get("type") in ("divider", "header"):
+                    end = cut
+                    break
+        messages.append(dict(rest, blocks=blocks[start:end]))
+        start = end
+    return messages
+
+def _redact(url):
+    # Webhook URLs are credentials: log only the host and the last characters
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/...{parts.path[-4:]}"
+
+class SlackDelivery:
+    """
+    Posts Block Kit payloads to Slack incoming webhooks over a pooled keep-alive
+    session. Deliveries fan out with bounded concurrency; messages for the same
+    webhook are sent in order, one at a time. 429/5xx responses and network
+    errors are retried with backoff (honouring Retry-After). Every delivery is
+    appended to a JSON-lines log.
+    """
+    def __init__(self, max_concurrency=None, max_retries=None, timeout=None, log_path=None):
+        self.max_concurrency = max_concurrency or Config.SLACK_MAX_CONCURRENCY
+        self.max_retries = Config.SLACK_MAX_RETRIES if max_retries is None else max_retries
+        self.timeout = timeout or Config.SLACK_TIMEOUT
+        self.log_path = log_path or Config.SLACK_DELIVERY_LOG
+        self._log_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def deliver(self, url, payload):
+        """
+        Sends `payload` (split into <=50-block messages) to one webhook.
+        Returns {"destination", "ok", "messages", "sent", "attempts", "error", "elapsed"}.
+        """
+        started = time.monotonic()
+        messages = split_blocks(payload)
+        result = {"destination": _redact(url), "ok": True, "messages": len(messages), "sent": 0, "attempts": 0, "error": None}
+        for message in messages:
+            attempts, error = self._post(url, message)
+            result["attempts"] += attempts
+            if error:
+                # Later parts would arrive out of context without this one
+                result["ok"] = False
+                result["error"] = error
+                break
+            result["sent"] += 1
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        self._log(result)
+        return result
+
+    def deliver_many(self, deliveries):
+        """
+        Sends many (url, payload) deliveries concurrently. Deliveries to the same
+        webhook run in order on one worker. Returns results in input order.
+        """
+        by_url = {}
+        for index, (url, payload) in enumerate(deliveries):
+            by_url.setdefault(url, []).append((index, payload))
+
+        results = [None] * len(deliveries)
+
+        def run(url, items):
+            for index, payload in items:
+                results[index] = self.deliver(url, payload)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="slack-delivery") as pool:
+            for future in [pool.submit(run, url, items) for url, items in by_url.items()]:
+                future.result()
+        return results
+
+    def _post(self, url, message):
+        """Posts one message with retries. Returns (attempts, error or None)."""
+        for attempt in range(self.max_retries + 1):
+            status = None
+            retry_after = None
+            try:
+                response = self.session.post(url, json=message, timeout=self.timeout)
+                status = response.status_code
+                if status == 200:
+                    return attempt + 1, None
+                error = f"HTTP {status}: {response.text[:200]}"
+                retry_after = response.headers.get("Retry-After")
+                if status not in RETRY_STATUSES:
+                    return attempt + 1, error
+            except requests.RequestException as e:
+                error = f"{type(e).__name__}: {e}"
+
+            if attempt == self.max_retries:
+                return attempt + 1, error
+
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = min(MAX_BACKOFF, 0.5 * 2 ** attempt) * random.uniform(0.8, 1.2)
+            print(f"[WARN] Slack webhook -> {status or 'network error'}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def _log(self, result):
+        entry = dict(result, at=datetime.now().isoformat())
+        try:
+            with self._log_lock:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"[WARN] Could not write Slack delivery log: {e}")
+
+    def close(self):
+        self.session.close()
+
+_delivery = None
+_delivery_lock = threading.Lock()
+
+def get_slack_delivery():
+    """Process-wide delivery client, so the connection pool is reused across sends."""
+    global _delivery
+    with _delivery_lock:
+        if _delivery is None:
+            _delivery = SlackDelivery()
+        return _delivery
@@ -1,11 +1,10 @@
 import os
 import sys
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.utils.config import Config
+from tools.utils.google_clients import get_service, get_service_account_credentials
 
 class AnalyticsFetcher:
     def __init__(self):
@@ -16,10 +15,8 @@ class AnalyticsFetcher:
         if self.creds_path and os.path.exists(self.creds_path):
             try:
                 scopes = ['https://www.googleapis.com/auth/spreadsheets.readonly']
-                creds = service_account.Credentials.from_service_account_file(
-                    self.creds_path, scopes=scopes
-                )
-                self.service = build('sheets', 'v4', credentials=creds)
+                creds = get_service_account_credentials(self.creds_path, scopes)
+                self.service = get_service('sheets', 'v4', creds)
             except Exception as e:
                 print(f"[ERROR] Failed to init Sheets service: {e}")
         else:
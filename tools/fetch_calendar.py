@@ -1,14 +1,11 @@
 import os
 import sys
 import datetime
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.utils.config import Config
+from tools.utils.google_clients import get_service
 
 # Scopes now include both Gmail and Calendar to maintain a single token
 SCOPES = [
@@ -16,15 +13,22 @@ SCOPES = [
     'https://www.googleapis.com/auth/calendar.readonly'
 ]
 
+# Incremental sync (local event store)
+SYNC_SOURCE = "calendar"
+SYNC_LOOKBACK_DAYS = 7 # Past events kept in the store
+SYNC_PAGE_SIZE = 250
+
 class CalendarFetcher:
-    def __init__(self, creds=None):
+    def __init__(self, creds=None, user_id=None):
         self.service = None
         self.creds = creds
+        # When set, events are synced incrementally into the local store and served from it
+        self.user_id = user_id
         self.authenticate()
 
         if self.creds:
             try:
-                self.service = build('calendar', 'v3', credentials=self.creds)
+                self.service = get_service('calendar', 'v3', self.creds)
             except Exception as e:
                 print(f"[ERROR] Failed to build Calendar service: {e}")
 
@@ -34,6 +38,10 @@ class CalendarFetcher:
         if self.creds and self.creds.valid:
             return
 
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         token_path = os.path.join(os.path.dirname(__file__), "..", "token.json")
         client_secrets_path = os.path.join(os.path.dirname(__file__), "..", Config.GOOGLE_CLIENT_SECRET_PATH)
 
@@ -79,12 +87,22 @@ class CalendarFetcher:
                 token.write(self.creds.to_json())
             print(f"[INFO] New token saved to {token_path}")
 
-    def fetch_upcoming_events(self, limit=10):
-        """Fetches the next 10 events from the primary calendar."""
+    def fetch_upcoming_events(self, limit=10, days=None):
+        """
+        Fetches upcoming events from the primary calendar, starting today.
+        With a user_id, events come from the local store (synced first) and
+        `limit`/`days` may be None to return the whole horizon.
+        """
         if not self.service:
             print("[WARN] Calendar service not available.")
             return []
 
+        if self.user_id:
+            try:
+                return self.fetch_stored_events(limit=limit, days=days)
+            except Exception as e:
+                print(f"[WARN] Calendar store sync failed: {e}. Falling back to live fetch.")
+
         try:
             # Fetch from Start of Today (Local Time) to see the whole day's context
             # Note: Ideally we handle timezones explicitly, but for local run, stripping time works for 'Today'
@@ -96,33 +114,146 @@ class CalendarFetcher:
             events_result = self.service.events().list(
                 calendarId='primary', 
                 timeMin=time_min,
-                maxResults=limit, 
+                maxResults=limit or 10, 
                 singleEvents=True,
                 orderBy='startTime'
             ).execute()
             
             events = events_result.get('items', [])
             
-            structured_events = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                structured_events.append({
-                    "event_id": event['id'],
-                    "summary": event.get('summary', 'Untitled Event'),
-                    "start": start,
-                    "end": end,
-                    "link": event.get('htmlLink'),
-                    "organizer": event.get('organizer', {}).get('email')
-                })
-                
-            return structured_events
+            return [self._to_event(event) for event in events]
 
         except Exception as e:
             print(f"[ERROR] Failed to fetch events: {e}")
             return []
 
+    def _to_event(self, event):
+        start = event['start'].get('dateTime', event['start'].get('date'))
+        end = event['end'].get('dateTime', event['end'].get('date'))
+        
+        return {
+            "event_id": event['id'],
+            "summary": event.get('summary', 'Untitled Event'),
+            "start": start,
+            "end": end,
+            "link": event.get('htmlLink'),
+            "organizer": event.get('organizer', {}).get('email')
+        }
+
+    @staticmethod
+    def _to_utc(iso_str):
+        """Parses an API dateTime/date into naive UTC. All-day dates are taken as UTC midnight."""
+        dt = datetime.datetime.fromisoformat(iso_str.replace('Z', '+00:00'))
+        if dt.tzinfo:
+            dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return dt
+
+    def fetch_stored_events(self, limit=None, days=None):
+        """Syncs the local store, then reads events from start of today (optionally `days` ahead)."""
+        from app.core.database import SessionLocal, init_db
+        from app.models.calendar import CalendarEvent
+
+        init_db()
+        db = SessionLocal()
+        try:
+            self.sync_events(db)
+
+            # Same 'Today' window as the live fetch (local midnight, treated as UTC)
+            start_of_day = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            query = db.query(CalendarEvent).filter(
+                CalendarEvent.user_id == self.user_id,
+                CalendarEvent.end_at > start_of_day
+            )
+            if days:
+                query = query.filter(CalendarEvent.start_at < start_of_day + datetime.timedelta(days=days))
+            query = query.order_by(CalendarEvent.start_at)
+            if limit:
+                query = query.limit(limit)
+            return [row.to_dict() for row in query]
+        finally:
+            db.close()
+
+    def sync_events(self, db):
+        """
+        Applies calendar changes since the stored syncToken to the local store.
+        Runs a full sync (from SYNC_LOOKBACK_DAYS ago) on first use or when Google
+        invalidates the token (410 Gone).
+        """
+        from app.models.user import SyncState
+        from app.models.calendar import CalendarEvent
+        from googleapiclient.errors import HttpError
+
+        state = db.query(SyncState).filter(
+            SyncState.user_id == self.user_id, SyncState.source == SYNC_SOURCE
+        ).first()
+        if not state:
+            state = SyncState(user_id=self.user_id, source=SYNC_SOURCE)
+            db.add(state)
+
+        events = db.query(CalendarEvent).filter(CalendarEvent.user_id == self.user_id)
+        lookback = datetime.datetime.utcnow() - datetime.timedelta(days=SYNC_LOOKBACK_DAYS)
+
+        params = {"calendarId": 'primary', "singleEvents": True, "maxResults": SYNC_PAGE_SIZE}
+        if state.cursor:
+            params["syncToken"] = state.cursor
+        else:
+            events.delete()
+            params["timeMin"] = lookback.isoformat() + 'Z'
+            state.full_synced_at = datetime.datetime.utcnow()
+
+        changed = 0
+        page_token = None
+        while True:
+            try:
+                result = self.service.events().list(pageToken=page_token, **params).execute()
+            except HttpError as e:
+                if e.resp.status != 410 or "syncToken" not in params:
+                    raise
+                print("[INFO] Calendar syncToken expired. Running full sync...")
+                events.delete()
+                params.pop("syncToken")
+                params["timeMin"] = lookback.isoformat() + 'Z'
+                state.full_synced_at = datetime.datetime.utcnow()
+                page_token = None
+                continue
+
+            items = result.get('items', [])
+            existing = {
+                row.event_id: row
+                for row in events.filter(CalendarEvent.event_id.in_([i['id'] for i in items]))
+            }
+            for item in items:
+                row = existing.get(item['id'])
+                if item.get('status') == 'cancelled':
+                    if row:
+                        db.delete(row)
+                    changed += 1
+                    continue
+
+                event = self._to_event(item)
+                if not row:
+                    row = CalendarEvent(user_id=self.user_id, event_id=event["event_id"])
+                    db.add(row)
+                row.summary = event["summary"]
+                row.start = event["start"]
+                row.end = event["end"]
+                row.start_at = self._to_utc(event["start"])
+                row.end_at = self._to_utc(event["end"])
+                row.link = event["link"]
+                row.organizer = event["organizer"]
+                changed += 1
+
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                state.cursor = result.get('nextSyncToken', state.cursor)
+                break
+
+        # Keep the store bounded to the lookback window
+        events.filter(CalendarEvent.end_at < lookback).delete()
+        db.commit()
+        if changed:
+            print(f"[INFO] Calendar sync applied {changed} event changes.")
+
 def run():
     fetcher = CalendarFetcher()
     return fetcher.fetch_upcoming_events()
@@ -1,29 +1,39 @@
 import os
 import sys
 import os.path
+from datetime import datetime
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.utils.config import Config
+from tools.utils.google_clients import get_service
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+# Gmail recommends at most 50 calls per batch request
+BATCH_SIZE = 50
+METADATA_HEADERS = ['Subject', 'From']
+# Partial response: only the parts of each message the brief renders
+METADATA_FIELDS = 'id,snippet,internalDate,payload/headers'
+
+# Incremental sync: how many starred messages to seed the local cache with
+FULL_SYNC_MAX = 100
+SYNC_SOURCE = "gmail"
+
 class GmailFetcher:
-    def __init__(self, creds=None):
+    def __init__(self, creds=None, user_id=None):
         self.service = None
         self.creds = creds
+        # When set, starred messages are synced incrementally into the local cache
+        self.user_id = user_id
         
         self.authenticate()
 
         if self.creds:
             try:
-                self.service = build('gmail', 'v1', credentials=self.creds)
+                self.service = get_service('gmail', 'v1', self.creds)
             except Exception as e:
                 print(f"[ERROR] Failed to build Gmail service: {e}")
 
@@ -33,6 +43,10 @@ class GmailFetcher:
         if self.creds and self.creds.valid:
             return
 
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         token_path = os.path.join(os.path.dirname(__file__), "..", "token.json")
         client_secrets_path = os.path.join(os.path.dirname(__file__), "..", Config.GOOGLE_CLIENT_SECRET_PATH)
 
@@ -76,34 +90,218 @@ class GmailFetcher:
             print("[WARN] Gmail service not available. Returning empty list.")
             return []
 
+        if self.user_id:
+            try:
+                return self.sync_flagged_emails(limit=limit)
+            except Exception as e:
+                print(f"[WARN] Incremental Gmail sync failed: {e}. Falling back to full listing.")
+
         try:
-            results = self.service.users().messages().list(userId='me', q='label:STARRED', maxResults=limit).execute()
+            results = self.service.users().messages().list(
+                userId='me', q='label:STARRED', maxResults=limit, fields='messages/id'
+            ).execute()
             messages = results.get('messages', [])
             
-            emails = []
             if not messages:
                 print("[INFO] No starred emails found.")
+                return []
 
-            for msg in messages:
-                txt = self.service.users().messages().get(userId='me', id=msg['id']).execute()
-                payload = txt.get('payload', {})
-                headers = payload.get('headers', [])
-                
-                subject = next((h['value'] for h in headers if h['name'] == 'Subject'), "No Subject")
-                sender = next((h['value'] for h in headers if h['name'] == 'From'), "Unknown")
-                
-                emails.append({
-                    "id": msg['id'],
-                    "subject": subject,
-                    "sender": sender,
-                    "snippet": txt.get('snippet', '')
-                })
-            return emails
+            return self.fetch_message_metadata([msg['id'] for msg in messages])
 
         except Exception as e:
             print(f"[ERROR] Failed to fetch emails: {e}")
             return []
 
+    def sync_flagged_emails(self, limit=5):
+        """
+        Serves starred emails from the local cache, applying only the label changes
+        since the stored Gmail historyId (users.history.list). Falls back to a full
+        resync on first run or when the historyId has expired.
+        """
+        from app.core.database import SessionLocal, init_db
+        from app.models.user import SyncState, FlaggedEmail
+        from googleapiclient.errors import HttpError
+
+        init_db()
+        db = SessionLocal()
+        try:
+            state = db.query(SyncState).filter(
+                SyncState.user_id == self.user_id, SyncState.source == SYNC_SOURCE
+            ).first()
+            if not state:
+                state = SyncState(user_id=self.user_id, source=SYNC_SOURCE)
+                db.add(state)
+
+            history_id = None
+            if state.cursor:
+                try:
+                    history_id = self._apply_history(db, state.cursor, limit)
+                except HttpError as e:
+                    if e.resp.status != 404:
+                        raise
+                    print("[INFO] Gmail historyId expired. Running full resync...")
+
+            if history_id is None:
+                history_id = self._full_sync(db)
+                state.full_synced_at = datetime.utcnow()
+            state.cursor = history_id
+            db.commit()
+
+            rows = db.query(FlaggedEmail).filter(
+                FlaggedEmail.user_id == self.user_id
+            ).order_by(FlaggedEmail.internal_date.desc()).limit(limit).all()
+            return [
+                {"id": r.message_id, "subject": r.subject, "sender": r.sender, "snippet": r.snippet}
+                for r in rows
+            ]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _full_sync(self, db):
+        """Rebuilds the cache from the newest starred messages. Returns the new historyId."""
+        from app.models.user import FlaggedEmail
+
+        # Read the historyId first so changes made during the listing are replayed next time
+        history_id = self.service.users().getProfile(userId='me', fields='historyId').execute()['historyId']
+
+        message_ids = []
+        page_token = None
+        while len(message_ids) < FULL_SYNC_MAX:
+            results = self.service.users().messages().list(
+                userId='me', q='label:STARRED', maxResults=FULL_SYNC_MAX - len(message_ids),
+                pageToken=page_token, fields='messages/id,nextPageToken'
+            ).execute()
+            message_ids.extend(m['id'] for m in results.get('messages', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        db.query(FlaggedEmail).filter(FlaggedEmail.user_id == self.user_id).delete()
+        self._cache_messages(db, message_ids)
+        print(f"[INFO] Gmail full sync cached {len(message_ids)} starred messages.")
+        return history_id
+
+    def _apply_history(self, db, start_history_id, limit):
+        """
+        Replays STARRED label changes since `start_history_id`. Returns the latest
+        historyId, or None when a full resync is needed instead (nothing is cached then).
+        """
+        from app.models.user import FlaggedEmail
+
+        starred = {} # message_id -> True (starred) / False (unstarred or deleted); last change wins
+        history_id = start_history_id
+        page_token = None
+        while True:
+            results = self.service.users().history().list(
+                userId='me', startHistoryId=start_history_id, labelId='STARRED',
+                historyTypes=['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved'],
+                pageToken=page_token
+            ).execute()
+
+            for record in results.get('history', []):
+                for item in record.get('messagesAdded', []):
+                    if 'STARRED' in item['message'].get('labelIds', []):
+                        starred[item['message']['id']] = True
+                for item in record.get('labelsAdded', []):
+                    if 'STARRED' in item.get('labelIds', []):
+                        starred[item['message']['id']] = True
+                for item in record.get('labelsRemoved', []):
+                    if 'STARRED' in item.get('labelIds', []):
+                        starred[item['message']['id']] = False
+                for item in record.get('messagesDeleted', []):
+                    starred[item['message']['id']] = False
+
+            history_id = results.get('historyId', history_id)
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        removed = [m for m, is_starred in starred.items() if not is_starred]
+        removed_count = 0
+        if removed:
+            removed_count = db.query(FlaggedEmail).filter(
+                FlaggedEmail.user_id == self.user_id, FlaggedEmail.message_id.in_(removed)
+            ).delete(synchronize_session=False)
+
+        cached_ids = {
+            m for (m,) in db.query(FlaggedEmail.message_id).filter(FlaggedEmail.user_id == self.user_id)
+        }
+        added = [m for m, is_starred in starred.items() if is_starred and m not in cached_ids]
+        # Unstarring can drop the cache below `limit` while older starred mail exists
+        # upstream. Decide before caching additions, which the resync would re-add.
+        if removed_count and len(cached_ids) + len(added) < limit:
+            print(f"[INFO] Gmail history sync left {len(cached_ids) + len(added)} cached messages. Running full resync...")
+            return None
+        self._cache_messages(db, added)
+
+        if starred:
+            print(f"[INFO] Gmail history sync: +{len(added)} / -{removed_count} starred messages.")
+        return history_id
+
+    def _cache_messages(self, db, message_ids):
+        from app.models.user import FlaggedEmail
+
+        for msg in self._fetch_raw_metadata(message_ids):
+            email = self._to_email(msg)
+            db.add(FlaggedEmail(
+                user_id=self.user_id,
+                message_id=email["id"],
+                subject=email["subject"],
+                sender=email["sender"],
+                snippet=email["snippet"],
+                internal_date=int(msg.get('internalDate', 0))
+            ))
+
+    def fetch_message_metadata(self, message_ids):
+        """
+        Fetches Subject/From/snippet for many messages using Gmail batch requests
+        (BATCH_SIZE calls per HTTP round trip, metadata format only).
+        Messages that fail individually are skipped. Order follows `message_ids`.
+        """
+        return [self._to_email(msg) for msg in self._fetch_raw_metadata(message_ids)]
+
+    def _fetch_raw_metadata(self, message_ids):
+        found = {}
+
+        def on_response(request_id, response, exception):
+            if exception:
+                print(f"[WARN] Failed to fetch message {request_id}: {exception}")
+                return
+            found[request_id] = response
+
+        for i in range(0, len(message_ids), BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for msg_id in message_ids[i:i + BATCH_SIZE]:
+                batch.add(
+                    self.service.users().messages().get(
+                        userId='me',
+                        id=msg_id,
+                        format='metadata',
+                        metadataHeaders=METADATA_HEADERS,
+                        fields=METADATA_FIELDS
+                    ),
+                    request_id=msg_id
+                )
+            batch.execute()
+
+        return [found[msg_id] for msg_id in message_ids if msg_id in found]
+
+    def _to_email(self, msg):
+        headers = msg.get('payload', {}).get('headers', [])
+        
+        subject = next((h['value'] for h in headers if h['name'] == 'Subject'), "No Subject")
+        sender = next((h['value'] for h in headers if h['name'] == 'From'), "Unknown")
+        
+        return {
+            "id": msg['id'],
+            "subject": subject,
+            "sender": sender,
+            "snippet": msg.get('snippet', '')
+        }
+
 def run():
     fetcher = GmailFetcher()
     return fetcher.fetch_flagged_emails()
@@ -1,11 +1,23 @@
 import os
 import sys
 import json
-from notion_client import Client
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.utils.config import Config
+from tools.utils.notion_gateway import get_notion_client
+
+# Nesting levels below the page that are walked (toggles, nested bullets)
+MAX_DEPTH = 3
+PAGE_SIZE = 100
+# Blocks whose children are separate documents, not part of this page
+SKIP_CHILDREN = ("child_page", "child_database")
+
+# Child lists and next pages are requested ahead of the walker. Sized to the Notion
+# concurrency cap; the shared gateway still rate-limits every call.
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=Config.NOTION_MAX_CONCURRENCY, thread_name_prefix="notion-blocks")
 
 class MeetingContentFetcher:
     def __init__(self):
@@ -15,7 +27,7 @@ class MeetingContentFetcher:
             print("[ERROR] Notion API Key not set.")
             self.client = None
         else:
-            self.client = Client(auth=self.api_key)
+            self.client = get_notion_client(self.api_key)
 
     def get_recent_meeting_id(self):
         """Finds the most recent meeting to test with."""
@@ -43,29 +55,62 @@ class MeetingContentFetcher:
             print(f"[ERROR] Failed to query database: {e}")
             return None, None
 
-    def fetch_blocks(self, block_id):
-        """Recursively fetches children blocks."""
+    def fetch_blocks(self, block_id, max_depth=MAX_DEPTH):
+        """Fetches the page's whole block tree (see iter_blocks) as a list."""
+        return list(self.iter_blocks(block_id, max_depth=max_depth))
+
+    def iter_blocks(self, block_id, max_depth=MAX_DEPTH):
+        """
+        Streams a page's blocks in document order: each block, then its children
+        (down to `max_depth` levels), then the next sibling. Blocks are yielded
+        as their page of results arrives. The next page and the children of every
+        block on the current page are fetched concurrently in the background.
+        """
         if not self.client:
-            return []
-        
-        all_blocks = []
+            return
+        yield from self._walk(block_id, 0, max_depth, None)
+
+    def _list_children(self, block_id, cursor=None):
+        kwargs = {"block_id": block_id, "page_size": PAGE_SIZE}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        return self.client.blocks.children.list(**kwargs)
+
+    def _prefetch(self, block_id, cursor=None):
+        # Copy the caller's context so the Notion priority carries into the pool
+        return _PREFETCH_POOL.submit(contextvars.copy_context().run, self._list_children, block_id, cursor)
+
+    def _walk(self, block_id, depth, max_depth, page):
+        pending = []
         try:
-            response = self.client.blocks.children.list(block_id=block_id)
-            results = response.get("results", [])
-            all_blocks.extend(results)
-            
-            # Handle pagination if needed (basic implementation)
-            while response.get("has_more"):
-                response = self.client.blocks.children.list(
-                    block_id=block_id, 
-                    start_cursor=response["next_cursor"]
-                )
-                all_blocks.extend(response.get("results", []))
-                
-            return all_blocks
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch blocks for {block_id}: {e}")
-            return []
+            while True:
+                try:
+                    response = page.result() if page else self._list_children(block_id)
+                except Exception as e:
+                    print(f"[ERROR] Failed to fetch blocks for {block_id}: {e}")
+                    return
+                results = response.get("results", [])
+
+                # Request what comes next now, so it loads while this page is consumed
+                page = self._prefetch(block_id, response["next_cursor"]) if response.get("has_more") else None
+                children = {}
+                if depth < max_depth:
+                    for block in results:
+                        if block.get("has_children") and block.get("type") not in SKIP_CHILDREN:
+                            children[block["id"]] = self._prefetch(block["id"])
+                pending = list(children.values()) + ([page] if page else [])
+
+                for block in results:
+                    yield block
+                    if block["id"] in children:
+                        yield from self._walk(block["id"], depth + 1, max_depth, children[block["id"]])
+
+                if not page:
+                    return
+        finally:
+            # Stopped early (or failed): drop prefetches that have not started
+            for future in pending:
+                future.cancel()
 
 def run():
     fetcher = MeetingContentFetcher()
@@ -1,11 +1,11 @@
 import os
 import sys
-from notion_client import Client
 from datetime import datetime, timedelta
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.utils.config import Config
+from tools.utils.notion_gateway import get_notion_client
 
 class NotionFetcher:
     def __init__(self):
@@ -14,7 +14,7 @@ class NotionFetcher:
             print("[ERROR] Notion API Key not set.")
             self.client = None
         else:
-            self.client = Client(auth=self.api_key)
+            self.client = get_notion_client(self.api_key)
 
     def fetch_high_priority_tasks(self, limit=5):
         """Fetches high priority tasks that are not done."""
@@ -92,7 +92,9 @@ class NotionFetcher:
                     "id": page["id"],
                     "title": title,
                     "date": props.get("Date", {}).get("date", {}).get("start", "No Date"),
-                    "url": page["url"]
+                    "url": page["url"],
+                    # Lets callers tell an edited note from an unchanged one
+                    "last_edited_time": page.get("last_edited_time")
                 })
             return meetings
 
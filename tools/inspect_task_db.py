@@ -1,11 +1,11 @@
 import os
 import sys
 import json
-from notion_client import Client
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.utils.config import Config
+from tools.utils.notion_gateway import get_notion_client
 
 def inspect_db():
     print(f"--- INSPECTING TASK DB ({Config.NOTION_TASK_DB_ID}) ---")
@@ -14,7 +14,7 @@ def inspect_db():
         print("[ERROR] No API Key found.")
         return
 
-    client = Client(auth=Config.NOTION_API_KEY)
+    client = get_notion_client()
     
     try:
         db = client.databases.retrieve(database_id=Config.NOTION_TASK_DB_ID)
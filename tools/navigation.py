@@ -1,58 +1,170 @@
 import json
 import os
 import sys
+import time
+import tempfile
+import contextvars
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from datetime import datetime
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from tools.utils.config import Config
+from tools.utils.cache import get_response_cache
+from tools.utils.notion_gateway import notion_priority, PRIORITY_CRITICAL
 from tools.fetch_notion import NotionFetcher
 from tools.fetch_gmail import GmailFetcher
 from tools.fetch_analytics import AnalyticsFetcher
 
 from tools.stylize import BriefStylizer
+from tools.deliver_slack import get_slack_delivery
 from tools.rank_tasks import TaskRanker
 from tools.analyze_meetings import MeetingAnalyzer
 from tools.analyze_schedule import ScheduleAnalyzer
 
-def generate_daily_brief(creds=None):
-    print(f"--- AEVEL HQ: Generating Daily Executive Brief [{datetime.now().isoformat()}] ---")
-    
-    # 1. Initialize Fetchers
-    # notion = NotionFetcher() # Deprecated for Tasks, but used for legacy meetings? 
-    # Actually NotionFetcher serves legacy meetings. TaskRanker serves tasks.
-    # To keep it clean, we instantiate what we need.
-    notion_legacy = NotionFetcher() 
-    gmail = GmailFetcher(creds=creds)
+# Shared pool for source fetches. Bounded so concurrent briefs queue instead of
+# opening unbounded upstream connections.
+_SOURCE_POOL = ThreadPoolExecutor(max_workers=Config.BRIEF_SOURCE_WORKERS, thread_name_prefix="brief-source")
+
+# Values used when a source times out or fails, so the brief keeps its shape.
+EMPTY_SCHEDULE = {
+    "events": [],
+    "analysis": {"conflicts": [], "conflict_groups": [], "high_priority_ids": [], "total_events": 0}
+}
+SOURCE_DEFAULTS = {
+    "tasks": [],
+    "meetings": ([], []),
+    "schedule": EMPTY_SCHEDULE,
+    "emails": [],
+    "metrics": [],
+}
+
+# Sources that are identical for every user (fetched once per batch run)
+SHARED_SOURCES = ("tasks", "meetings", "metrics")
+
+def gather_sources(sources, timeouts=None, deadline=None, on_result=None):
+    """
+    Runs independent source fetches concurrently.
+    `sources` maps a name to a zero-arg callable. Each source gets its own timeout
+    (capped by the overall deadline); slow or failing sources fall back to
+    SOURCE_DEFAULTS and are listed in the returned `partial` list.
+    `on_result(name, value)` is called on this thread as each source settles.
+    """
+    timeouts = timeouts or {}
+    deadline = Config.BRIEF_DEADLINE if deadline is None else deadline
+    started = time.monotonic()
+
+    expiry = {}
+    pending = {}
+    for name, fn in sources.items():
+        expiry[name] = started + min(timeouts.get(name, Config.BRIEF_SOURCE_TIMEOUT), deadline)
+        # Copy the caller's context so settings like the Notion priority carry into the pool
+        pending[_SOURCE_POOL.submit(contextvars.copy_context().run, fn)] = name
+
+    results = {}
+    partial = []
+    while pending:
+        now = time.monotonic()
+        for fut, name in list(pending.items()):
+            if now >= expiry[name]:
+                fut.cancel()
+                del pending[fut]
+                partial.append(name)
+                print(f"[WARN] Source '{name}' timed out after {now - started:.1f}s. Continuing without it.")
+                results[name] = SOURCE_DEFAULTS.get(name)
+                if on_result:
+                    on_result(name, results[name])
+        if not pending:
+            break
+
+        wait_for = min(expiry[name] for name in pending.values()) - now
+        done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for fut in done:
+            name = pending.pop(fut)
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                print(f"[ERROR] Source '{name}' failed: {e}")
+                partial.append(name)
+                results[name] = SOURCE_DEFAULTS.get(name)
+            if on_result:
+                on_result(name, results[name])
+
+    return results, partial
+
+def shared_sources():
+    """
+    Fetchers for sources that are the same for every user: the Notion task and
+    meeting DBs and the analytics sheet all come from shared config.
+    """
+    # NotionFetcher serves legacy meetings. TaskRanker serves tasks.
+    notion_legacy = NotionFetcher()
     analytics = AnalyticsFetcher()
-    
     ranker = TaskRanker()
     analyzer = MeetingAnalyzer()
-    scheduler = ScheduleAnalyzer(creds=creds)
-    
-    # 2. Fetch Data (Layer 3)
-    print("Fetching & Ranking Tasks...")
-    tasks = ranker.fetch_ranked_tasks(limit=5)
-    
-    # Legacy: Notion Meetings (Notes)
-    meetings = notion_legacy.fetch_recent_meetings()
-    
-    meeting_insights = []
-    if meetings:
-        print(f"Analyzing {len(meetings)} recent meetings...")
-        for m in meetings:
-            insight = analyzer.analyze_meeting(m["id"], title=m["title"], date=m["date"])
-            meeting_insights.append(insight)
-
-    # New: Calendar Schedule
-    print("Analyzing Schedule...")
-    schedule_analysis = scheduler.analyze_schedule()
-    
-    print("Fetching Emails...")
-    emails = gmail.fetch_flagged_emails()
+    cache = get_response_cache()
+
+    def fetch_meetings():
+        # Legacy: Notion Meetings (Notes). Analysis depends on the list, so it stays in this source.
+        meetings = notion_legacy.fetch_recent_meetings()
+        return meetings, analyzer.analyze_many(meetings)
+
+    return {
+        "tasks": lambda: cache.get_or_fetch("shared", "tasks", {"limit": 5}, lambda: ranker.fetch_ranked_tasks(limit=5)),
+        "meetings": lambda: cache.get_or_fetch("shared", "meetings", None, fetch_meetings),
+        "metrics": lambda: cache.get_or_fetch("shared", "metrics", None, analytics.fetch_metrics),
+    }
+
+def user_sources(creds=None, user_id=None):
+    """Fetchers for the user's own Google data (schedule, flagged emails)."""
+    gmail = GmailFetcher(creds=creds, user_id=user_id)
+    scheduler = ScheduleAnalyzer(creds=creds, user_id=user_id)
+    cache = get_response_cache()
+    user_key = user_id or "local"
+
+    return {
+        "schedule": lambda: cache.get_or_fetch(user_key, "schedule", None, scheduler.analyze_schedule),
+        "emails": lambda: cache.get_or_fetch(user_key, "emails", {"limit": 5}, gmail.fetch_flagged_emails),
+    }
+
+def prefetch_shared_sources():
+    """Fetches the shared sources once, e.g. before a batch run. Failed sources are left out."""
+    with notion_priority(PRIORITY_CRITICAL):
+        results, partial = gather_sources(shared_sources())
+    return {name: value for name, value in results.items() if name not in partial}
+
+def generate_daily_brief(creds=None, user_id=None, on_section=None, prefetched=None, priority=PRIORITY_CRITICAL):
+    """
+    Builds the brief and its Slack/email renderings.
+    `on_section(name, data)` receives each section (tasks, meetings, schedule,
+    emails, metrics) as soon as its source completes, for progressive delivery.
+    `prefetched` maps source names to values already fetched (see prefetch_shared_sources).
+    `priority` is the Notion rate-limiter priority of its queries (precomputes run at
+    PRIORITY_BACKGROUND).
+    """
+    print(f"--- AEVEL HQ: Generating Daily Executive Brief [{datetime.now().isoformat()}] ---")
+    prefetched = prefetched or {}
     
-    print("Fetching Analytics...")
-    metrics = analytics.fetch_metrics()
+    # 1. Initialize Fetchers
+    # Construction stays on this thread so any interactive OAuth flow runs once, in order.
+    sources = {name: (lambda value=value: value) for name, value in prefetched.items()}
+    if not all(name in prefetched for name in SHARED_SOURCES):
+        for name, fetch in shared_sources().items():
+            sources.setdefault(name, fetch)
+    sources.update(user_sources(creds=creds, user_id=user_id))
+
+    # 2. Fetch Data (Layer 3) - all sources fan out concurrently, served from cache when fresh
+    print("Fetching sources (tasks, meetings, schedule, emails, metrics)...")
+    with notion_priority(priority):
+        results, partial = gather_sources(sources, on_result=on_section)
+
+    tasks = results["tasks"]
+    meetings, meeting_insights = results["meetings"]
+    schedule_analysis = results["schedule"]
+    emails = results["emails"]
+    metrics = results["metrics"]
     
     # 3. Aggregation & Synthesis (Layer 2)
     daily_brief = {
@@ -68,60 +180,156 @@ def generate_daily_brief(creds=None):
         "meeting_insights": meeting_insights,
         "schedule": schedule_analysis, # New payload
         "flagged_emails": emails,
-        "metrics": metrics
+        "metrics": metrics,
+        "partial_sources": partial # Sources that timed out or failed for this run
     }
     
     # 4. Stylize (Phase S)
     print("Stylizing Outputs...")
-    slack_payload = BriefStylizer.to_slack_blocks(daily_brief)
-    email_html = BriefStylizer.to_email_html(daily_brief)
+    slack_payload, email_html = BriefStylizer.render(daily_brief)
 
     # 5. Output
+    # Signed-in users' briefs are stored per user/date by the API (brief history);
+    # only local CLI runs write the shared .tmp/ files.
+    if user_id is None:
+        write_outputs(daily_brief, slack_payload, email_html)
+    
+    return daily_brief, slack_payload
+
+def _write_atomic(path, text):
+    # Write-then-rename so concurrent runs never leave a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+def write_outputs(daily_brief, slack_payload, email_html):
+    """Saves the raw brief, Slack payload and email body to .tmp/."""
     tmp_dir = os.path.join(os.path.dirname(__file__), "..", ".tmp")
     os.makedirs(tmp_dir, exist_ok=True)
     
     # Save Raw
-    with open(os.path.join(tmp_dir, "daily_brief.json"), "w") as f:
-        json.dump(daily_brief, f, indent=2)
+    _write_atomic(os.path.join(tmp_dir, "daily_brief.json"), json.dumps(daily_brief, indent=2))
 
     # Save Slack
-    with open(os.path.join(tmp_dir, "slack_payload.json"), "w") as f:
-        json.dump(slack_payload, f, indent=2)
+    _write_atomic(os.path.join(tmp_dir, "slack_payload.json"), json.dumps(slack_payload, indent=2))
 
     # Save Email
-    with open(os.path.join(tmp_dir, "email_body.html"), "w", encoding='utf-8') as f:
-        f.write(email_html)
+    _write_atomic(os.path.join(tmp_dir, "email_body.html"), email_html)
         
     print(f"[SUCCESS] Brief generated in .tmp/:")
     print(f" - raw: daily_brief.json")
     print(f" - slack: slack_payload.json")
     print(f" - email: email_body.html")
-    
-    return daily_brief, slack_payload
 
 def send_to_slack(payload):
     url = Config.SLACK_WEBHOOK_URL
     if not url or "placeholder" in url:
         print("[ERROR] Slack Webhook URL not configured. Cannot send.")
-        return
+        return None
+
+    print("Sending to Slack...")
+    result = get_slack_delivery().deliver(url, payload)
+    if result["ok"]:
+        print(f"[SUCCESS] Posted to Slack ({result['messages']} message(s), {result['attempts']} attempt(s)).")
+    else:
+        print(f"[ERROR] Slack delivery failed after {result['sent']}/{result['messages']} message(s): {result['error']}")
+    return result
+
+# Shared source values for batch workers, set once per worker process
+_batch_shared = None
+
+def _init_batch_worker(shared):
+    global _batch_shared
+    _batch_shared = shared
 
+def _build_user_brief(user_id):
+    """Batch worker: builds and stores one user's brief. Returns (user_id, seconds, error, partial)."""
+    from app.core.database import SessionLocal
+    from app.core.brief_store import save_brief
+    from app.core.credentials import get_google_creds
+
+    started = time.perf_counter()
+    db = SessionLocal()
     try:
-        import requests
-        print(f"Sending to Slack ({url})...")
-        response = requests.post(url, json=payload)
-        if response.status_code == 200:
-            print("[SUCCESS] Posted to Slack.")
-        else:
-            print(f"[ERROR] Slack API returned {response.status_code}: {response.text}")
+        creds = get_google_creds(user_id, db)
+        brief, _ = generate_daily_brief(creds=creds, user_id=user_id, prefetched=_batch_shared)
+        save_brief(db, user_id, brief)
+        return user_id, time.perf_counter() - started, None, brief["partial_sources"]
     except Exception as e:
-        print(f"[ERROR] Failed to send to Slack: {e}")
+        return user_id, time.perf_counter() - started, str(e), []
+    finally:
+        db.close()
+
+def generate_all_briefs(workers=None):
+    """
+    Builds and stores today's brief for every user with a Google token, on a
+    process pool. Shared sources are fetched once here and handed to every worker.
+    Returns the per-user (user_id, seconds, error, partial) results.
+    """
+    from app.core.database import SessionLocal, init_db
+    from app.models.user import User, OAuthToken
+
+    init_db()
+    db = SessionLocal()
+    try:
+        user_ids = [uid for (uid,) in db.query(User.id).join(OAuthToken, OAuthToken.user_id == User.id)]
+    finally:
+        db.close()
+    if not user_ids:
+        print("[WARN] No users with a Google token. Nothing to do.")
+        return []
+
+    started = time.perf_counter()
+    print(f"--- BATCH: {len(user_ids)} users ---")
+    print("Prefetching shared sources (tasks, meetings, metrics)...")
+    shared = prefetch_shared_sources()
+    print(f"Shared sources ready in {time.perf_counter() - started:.1f}s.")
+
+    workers = workers or os.cpu_count() or 1
+    # Spawned workers start clean: no copies of this process's pools, locks or DB connections
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(user_ids)), mp_context=context,
+                             initializer=_init_batch_worker, initargs=(shared,)) as pool:
+        futures = [pool.submit(_build_user_brief, user_id) for user_id in user_ids]
+        for future in as_completed(futures):
+            user_id, seconds, error, partial = future.result()
+            results.append((user_id, seconds, error, partial))
+            status = f"FAILED: {error}" if error else "ok" + (f" (partial: {', '.join(partial)})" if partial else "")
+            print(f"[BATCH] User {user_id}: {seconds:.1f}s {status}")
+
+    report_batch(results, time.perf_counter() - started)
+    return results
+
+def report_batch(results, wall):
+    timings = sorted(seconds for _, seconds, _, _ in results)
+    failed = [user_id for user_id, _, error, _ in results if error]
+    print(f"\n--- BATCH DONE: {len(results) - len(failed)}/{len(results)} briefs in {wall:.1f}s ---")
+    print(f"  per user: p50 {timings[len(timings) // 2]:.1f}s  "
+          f"p95 {timings[min(len(timings) - 1, int(0.95 * len(timings)))]:.1f}s  max {timings[-1]:.1f}s")
+    print(f"  slowest: " + ", ".join(
+        f"{user_id} ({seconds:.1f}s)" for user_id, seconds, _, _ in sorted(results, key=lambda r: -r[1])[:5]
+    ))
+    if failed:
+        print(f"  failed: {', '.join(str(user_id) for user_id in failed)}")
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Generate and optionally send Aevel HQ Daily Brief.")
     parser.add_argument("--send", action="store_true", help="Send the brief to configured channels (Slack).")
+    parser.add_argument("--all-users", action="store_true", help="Build and store today's brief for every registered user.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --all-users (default: CPU count).")
     args = parser.parse_args()
 
+    if args.all_users:
+        generate_all_briefs(workers=args.workers)
+        sys.exit(0)
+
     brief, slack_data = generate_daily_brief()
 
     if args.send:
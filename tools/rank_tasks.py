@@ -1,19 +1,35 @@
 import os
 import sys
 import json
+import heapq
+import threading
 from datetime import datetime, timedelta
-from notion_client import Client
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from tools.utils.config import Config
+from tools.utils.notion_gateway import get_notion_client
+
+NOT_DONE_FILTER = {
+    "property": "Status",
+    "status": {
+        "does_not_equal": "Done"
+    }
+}
+PRIORITY_POINTS = {"High": 30, "Medium": 10, "Low": -10}
+# Periodic full reload drops tasks that were archived/deleted in Notion
+MIRROR_FULL_REFRESH_HOURS = 24
+# Serializes mirror refreshes when several briefs run at once
+_MIRROR_LOCK = threading.Lock()
 
 class TaskRanker:
-    def __init__(self):
+    def __init__(self, use_mirror=True):
         self.api_key = Config.NOTION_API_KEY
         self.db_id = Config.NOTION_TASK_DB_ID
+        # Rank against the local mirror of the task DB (falls back to live queries)
+        self.use_mirror = use_mirror
         if self.api_key:
-            self.client = Client(auth=self.api_key)
+            self.client = get_notion_client(self.api_key)
         else:
             self.client = None
 
@@ -26,102 +42,197 @@ class TaskRanker:
             return "Low"
         return "Medium"
 
-    def _calculate_score(self, task):
-        # Base Score
-        score = 50
-        
-        # 1. Priority Modifier
-        priority = task.get("priority", "Medium")
-        if priority == "High": score += 30
-        elif priority == "Medium": score += 10
-        elif priority == "Low": score -= 10
-        
-        # 2. Status Modifier
-        # Encouraging "In progress" to get finished
-        status = task.get("status", "Not started")
-        if status == "In progress": score += 15
-        
-        # 3. Urgency Modifier (Due Date)
-        due_date_str = task.get("due_date")
-        if due_date_str:
-            try:
-                due = datetime.fromisoformat(due_date_str)
-                now = datetime.now()
-                delta = (due - now).days
-                
-                if delta < 0: score += 40 # Overdue
-                elif delta == 0: score += 20 # Due Today
-                elif delta == 1: score += 10 # Due Tomorrow
-                elif delta < 7: score += 5   # Due this week
-            except:
-                pass
-                
-        return score
-
     def fetch_ranked_tasks(self, limit=5):
         if not self.client:
             return []
 
         print("Fetching and Ranking Tasks...")
+
+        if self.use_mirror and self.db_id:
+            try:
+                return self._rank(self.fetch_mirrored_tasks(), limit)
+            except Exception as e:
+                print(f"[WARN] Task mirror unavailable: {e}. Querying Notion directly.")
         
         # Fetch generic "Not Done" tasks
         # We filter logic in python for simplicity of "Done" check if status naming varies
         try:
-            results = self.client.databases.query(
-                database_id=self.db_id,
-                filter={
-                    "property": "Status",
-                    "status": {
-                        "does_not_equal": "Done"
-                    }
-                }
-            ).get("results", [])
-            
-            ranked_tasks = []
-            for page in results:
-                props = page["properties"]
-                
-                # Extract Title (property: 'Milestone')
-                title_list = props.get("Milestone", {}).get("title", [])
-                title = title_list[0]["plain_text"] if title_list else "Untitled"
-                
-                # Extract Status
-                status = "Unknown"
-                if "Status" in props:
-                    status = props["Status"]["status"]["name"]
-                
-                # Extract Due Date (property: 'Due date')
-                due_date = None
-                if "Due date" in props and props["Due date"]["date"]:
-                    due_date = props["Due date"]["date"]["start"]
-                
-                # Extract Priority (property: 'Priority')
-                priority = "Medium"
-                if "Priority" in props and props["Priority"]["select"]:
-                    priority = props["Priority"]["select"]["name"]
-                
-                task_obj = {
-                    "task_id": page["id"],
-                    "title": title,
-                    "status": status,
-                    "priority": priority,
-                    "due_date": due_date,
-                    "url": page["url"]
-                }
-                
-                # Calc Score
-                task_obj["score"] = self._calculate_score(task_obj)
-                ranked_tasks.append(task_obj)
-                
-            # Sort by Score Descending
-            ranked_tasks.sort(key=lambda x: x["score"], reverse=True)
-            
-            return ranked_tasks[:limit]
+            pages = self._query_all(NOT_DONE_FILTER)
+            return self._rank([self._parse_task(page) for page in pages], limit)
 
         except Exception as e:
             print(f"[ERROR] Ranking failed: {e}")
             return []
 
+    def score_tasks(self, tasks, now=None):
+        """
+        Scores every task in one vectorized pass against a single reference time:
+        50 base, plus PRIORITY_POINTS, +15 when in progress, and +40/+20/+10/+5
+        when the due date is overdue / today / tomorrow / within a week. Returns a list of ints.
+        """
+        if not tasks:
+            return []
+        import numpy as np
+        import pandas as pd
+        now = now or datetime.now()
+
+        df = pd.DataFrame(tasks, columns=["priority", "status", "due_date"])
+        score = 50 + df["priority"].fillna("Medium").map(PRIORITY_POINTS).fillna(0)
+        score += (df["status"] == "In progress") * 15
+
+        # Due dates: date-only values are local; values with an offset are converted to local time
+        due_str = df["due_date"].astype("string")
+        due = pd.to_datetime(due_str, format="ISO8601", utc=True, errors="coerce")
+        has_offset = due_str.str.contains(r"(?:Z|[+-]\d\d:?\d\d)$", regex=True).fillna(False).astype(bool)
+        local_tz = now.astimezone().tzinfo
+        due_local = due.dt.tz_localize(None).where(~has_offset, due.dt.tz_convert(local_tz).dt.tz_localize(None))
+
+        # Same whole-day floor as timedelta.days
+        delta = (due_local - pd.Timestamp(now)) // pd.Timedelta(days=1)
+        urgency = np.select(
+            [delta < 0, delta == 0, delta == 1, delta < 7],
+            [40, 20, 10, 5],
+            default=0
+        )
+        return (score + urgency).astype(int).tolist()
+
+    def _rank(self, tasks, limit, now=None):
+        scores = self.score_tasks(tasks, now=now)
+        for task_obj, score in zip(tasks, scores):
+            task_obj["score"] = score
+            
+        # Top-k by Score Descending (heap selection; ties keep input order)
+        return heapq.nlargest(limit, tasks, key=lambda x: x["score"])
+
+    def _query_all(self, query_filter):
+        """Queries the task database, following pagination to the last page."""
+        pages = []
+        cursor = None
+        while True:
+            kwargs = {"database_id": self.db_id, "filter": query_filter, "page_size": 100}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+            response = self.client.databases.query(**kwargs)
+            pages.extend(response.get("results", []))
+            if not response.get("has_more"):
+                return pages
+            cursor = response["next_cursor"]
+
+    def _parse_task(self, page):
+        props = page["properties"]
+        
+        # Extract Title (property: 'Milestone')
+        title_list = props.get("Milestone", {}).get("title", [])
+        title = title_list[0]["plain_text"] if title_list else "Untitled"
+        
+        # Extract Status
+        status = "Unknown"
+        if "Status" in props:
+            status = props["Status"]["status"]["name"]
+        
+        # Extract Due Date (property: 'Due date')
+        due_date = None
+        if "Due date" in props and props["Due date"]["date"]:
+            due_date = props["Due date"]["date"]["start"]
+        
+        # Extract Priority (property: 'Priority')
+        priority = "Medium"
+        if "Priority" in props and props["Priority"]["select"]:
+            priority = props["Priority"]["select"]["name"]
+        
+        return {
+            "task_id": page["id"],
+            "title": title,
+            "status": status,
+            "priority": priority,
+            "due_date": due_date,
+            "url": page["url"]
+        }
+
+    def fetch_mirrored_tasks(self):
+        """Refreshes the local task mirror, then returns all not-Done tasks from it."""
+        from app.core.database import SessionLocal, init_db
+        from app.models.task import NotionTask
+
+        init_db()
+        db = SessionLocal()
+        try:
+            with _MIRROR_LOCK:
+                self.sync_mirror(db)
+            rows = db.query(NotionTask).filter(
+                NotionTask.database_id == self.db_id,
+                NotionTask.status != "Done"
+            ).all()
+            return [row.to_dict() for row in rows]
+        finally:
+            db.close()
+
+    def sync_mirror(self, db):
+        """
+        Mirrors the Notion task DB locally. The first run (and one every
+        MIRROR_FULL_REFRESH_HOURS, to drop archived pages) loads every not-Done
+        task; otherwise only pages edited since the stored cursor are fetched.
+        """
+        from app.models.user import SyncState
+        from app.models.task import NotionTask
+
+        source = f"notion_tasks:{self.db_id}"
+        state = db.query(SyncState).filter(
+            SyncState.user_id.is_(None), SyncState.source == source
+        ).first()
+        if not state:
+            state = SyncState(source=source)
+            db.add(state)
+
+        mirror = db.query(NotionTask).filter(NotionTask.database_id == self.db_id)
+        now = datetime.utcnow()
+        full = (
+            not state.cursor
+            or not state.full_synced_at
+            or now - state.full_synced_at > timedelta(hours=MIRROR_FULL_REFRESH_HOURS)
+        )
+
+        if full:
+            pages = self._query_all(NOT_DONE_FILTER)
+            mirror.delete()
+            state.full_synced_at = now
+            print(f"[INFO] Task mirror full load: {len(pages)} tasks.")
+        else:
+            # Notion rounds last_edited_time to the minute, so on_or_after re-reads the
+            # cursor minute; upserts make that harmless. No status filter here, so
+            # tasks moving to Done are picked up too.
+            pages = self._query_all({
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": state.cursor}
+            })
+
+        existing = {}
+        if not full and pages:
+            existing = {
+                row.task_id: row
+                for row in mirror.filter(NotionTask.task_id.in_([p["id"] for p in pages]))
+            }
+
+        cursor = state.cursor
+        for page in pages:
+            task = self._parse_task(page)
+            row = existing.get(task["task_id"])
+            if not row:
+                row = NotionTask(database_id=self.db_id, task_id=task["task_id"])
+                db.add(row)
+            row.title = task["title"]
+            row.status = task["status"]
+            row.priority = task["priority"]
+            row.due_date = task["due_date"]
+            row.url = task["url"]
+            row.last_edited_time = page.get("last_edited_time")
+            if row.last_edited_time and (not cursor or row.last_edited_time > cursor):
+                cursor = row.last_edited_time
+
+        # An empty database still gets a cursor so the next run is incremental
+        state.cursor = cursor or now.isoformat() + "Z"
+        db.commit()
+
 def run():
     ranker = TaskRanker()
     return ranker.fetch_ranked_tasks()
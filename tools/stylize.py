@@ -1,320 +1,389 @@
+import os
+import sys
 import json
+import html
+from collections import Counter
 from datetime import datetime
 
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from tools.utils.cache import MemoryBackend, fingerprint
+
+# Brief keys each cacheable section is rendered from, in output order
+SECTION_INPUTS = {
+    "tasks": ("priorities",),
+    "schedule": ("schedule",),
+    "insights": ("meeting_insights",),
+    "emails": ("flagged_emails",),
+    "metrics": ("metrics",),
+}
+
+# Rendered (Slack blocks, HTML lines) pairs keyed by (section, content fingerprint).
+# Content-addressed, so unchanged sections are reused across runs and across users
+# sharing the same data. Cached fragments are shared: treat them as read-only.
+_fragments = MemoryBackend(max_entries=512)
+
+EMAIL_CSS = """
+            body { font-family: Arial, sans-serif; color: #333; max-width: 600px; margin: 0 auto; }
+            h1 { font-size: 24px; color: #2c3e50; border-bottom: 2px solid #eee; padding-bottom: 10px; }
+            h2 { font-size: 18px; color: #2980b9; margin-top: 20px; }
+            .summary { margin-bottom: 20px; background: #f9f9f9; padding: 15px; border-radius: 5px; }
+            .summary span { margin-right: 15px; font-weight: bold; }
+            ul { list-style-type: none; padding: 0; }
+            li { padding: 8px 0; border-bottom: 1px solid #eee; }
+            .urgent { color: #c0392b; font-weight: bold; }
+            .footer { font-size: 12px; color: #999; margin-top: 30px; border-top: 1px solid #eee; padding-top: 10px; }
+            a { color: #3498db; text-decoration: none; }
+"""
+
+def _h(value):
+    value = str(value)
+    # Most values need no escaping: plain substring checks are far cheaper than the replaces
+    if "&" in value or "<" in value or ">" in value or '"' in value or "'" in value:
+        return html.escape(value)
+    return value
+
+def _s(value):
+    # Slack mrkdwn control characters (https://api.slack.com/reference/surfaces/formatting#escaping)
+    value = str(value)
+    if "&" in value or "<" in value or ">" in value:
+        return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return value
+
+# Fragment renderers: user-supplied values go through _h (HTML) / _s (Slack);
+# icons, colours, times and prebuilt markup are inserted as-is
+HTML_HEAD = f"<html><head><style>{EMAIL_CSS}</style></head><body>"
+HTML_HIGH_PRIORITY = "<span style='background:#fff3cd; padding:2px 5px; border-radius:3px; font-size:0.8em; margin-left:5px;'>⭐ High Priority</span>"
+
+def _html_title(date):
+    return f"<h1>Daily Executive Brief 📅 {_h(date)}</h1>"
+
+def _html_summary(tasks, meetings, urgent):
+    return f"""
+        <div class="summary">
+            <span>Tasks: {_h(tasks)}</span>
+            <span>Meetings: {_h(meetings)}</span>
+            <span>Urgent: {_h(urgent)}</span>
+        </div>
+        """
+
+def _html_task(score, color, priority, icon, url, title):
+    return (
+        f"<li><span style='background:#eee; padding:2px 5px; border-radius:3px; font-family:monospace; margin-right:5px;'>{_h(score)}</span> "
+        f"<span style='color:{color}; font-weight:bold;'>{_h(priority)}</span> {icon} <a href='{_h(url)}'>{_h(title)}</a></li>"
+    )
+
+def _html_item(text):
+    return f"<li>{_h(text)}</li>"
+
+def _html_action(icon, task):
+    return f"<li>{icon} {_h(task)}</li>"
+
+def _html_event(style, time, url, summary, tags):
+    return f"<li style='{style}'>{time}: <a href='{_h(url)}'>{_h(summary)}</a> {tags}</li>"
+
+def _html_insight_title(title):
+    return f"<h3>🧠 {_h(title)}</h3>"
+
+def _html_email(subject, sender):
+    return f"<li class='urgent'>🚨 {_h(subject)}<br/><small style='color:#666; font-weight:normal;'>From: {_h(sender)}</small></li>"
+
+def _html_metric(metric, value):
+    return f"<li><b>{_h(metric)}</b>: {_h(value)}</li>"
+
+def _html_footer(generated_at):
+    return f"<div class='footer'>Generated at {_h(generated_at)}</div>"
+
+def _slack_count(label, count):
+    return f"*{label}:* {_s(count)}"
+
+def _slack_task(score, priority_icon, status_icon, url, title):
+    return f"{score} {priority_icon} {status_icon} *<{_s(url)}|{_s(title)}>*"
+
+def _slack_event(icon, time, url, summary, tags):
+    return f"{icon} *{time}*: <{_s(url)}|{_s(summary)}> {tags}"
+
+def _slack_bullet(text):
+    return f"• {_s(text)}"
+
+def _slack_action(icon, task):
+    return f"• {icon} {_s(task)}"
+
+def _slack_email(subject, sender):
+    return f"🚨 *{_s(subject)}*\nFrom: {_s(sender)}"
+
+def _slack_metric(metric, value):
+    return f"• *{_s(metric)}*: {_s(value)}"
+
+def _slack_footer(generated_at):
+    return f"Generated at {_s(generated_at)}"
+
+def _mrkdwn(text):
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+def _time_label(start):
+    """HH:MM of an event start as written (wall clock in its own offset; 00:00 for all-day)."""
+    if len(start) >= 16 and start[10] == "T":
+        return start[11:16]
+    return datetime.fromisoformat(start.replace('Z', '+00:00')).strftime("%H:%M")
+
 class BriefStylizer:
     @staticmethod
-    def to_slack_blocks(data):
-        """Converts daily brief data to Slack Block Kit format."""
+    def render(data, _fingerprints=None):
+        """Renders the brief once into (Slack Block Kit payload, HTML email body)."""
         date_str = data.get("date", "Today")
         summary = data.get("summary", {})
-        
+        task_count = summary.get('task_count', 0)
+        meeting_count = summary.get('meeting_count', 0)
+        urgent_count = summary.get('urgent_email_count', 0)
+
         blocks = [
             {
                 "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"Daily Executive Brief 📅 {date_str}"
-                }
+                "text": {"type": "plain_text", "text": f"Daily Executive Brief 📅 {date_str}"}
             },
             {
                 "type": "section",
                 "fields": [
-                    {"type": "mrkdwn", "text": f"*Tasks:* {summary.get('task_count', 0)}"},
-                    {"type": "mrkdwn", "text": f"*Meetings:* {summary.get('meeting_count', 0)}"},
-                    {"type": "mrkdwn", "text": f"*Urgent:* {summary.get('urgent_email_count', 0)}"}
+                    {"type": "mrkdwn", "text": _slack_count(label="Tasks", count=task_count)},
+                    {"type": "mrkdwn", "text": _slack_count(label="Meetings", count=meeting_count)},
+                    {"type": "mrkdwn", "text": _slack_count(label="Urgent", count=urgent_count)}
                 ]
             },
             {"type": "divider"}
         ]
+        lines = [
+            HTML_HEAD,
+            _html_title(date=date_str),
+            _html_summary(tasks=task_count, meetings=meeting_count, urgent=urgent_count)
+        ]
 
-        # Priorities (Work Order)
-        tasks = data.get("priorities", [])
-        if tasks:
-            task_lines = []
-            for t in tasks:
-                status_icon = "✅" if t.get("status") == "Done" else "⚠️" if t.get("status") == "In progress" else "⭕"
-                
-                # Score visualization
-                score = t.get("score", 0)
-                score_str = f"`{score}`" if score else ""
-                
-                # Priority icon
-                prio = t.get("priority", "Medium")
-                prio_icon = "🔥" if prio == "High" else "🔽" if prio == "Low" else "🔹"
-                
-                line = f"{score_str} {prio_icon} {status_icon} *<{t.get('url', '#')}|{t.get('title', 'Untitled')}>*"
-                task_lines.append(line)
-            
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*🏆 Work Order (Top 5)*\n" + "\n".join(task_lines)
-                }
-            })
-        else:
-             blocks.append({
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": "*🏆 Work Order*\n_No tasks found._"}
-            })
-
-        # Schedule (New Calendar Intelligence)
-        schedule = data.get("schedule", {})
-        events = schedule.get("events", [])
-        analysis = schedule.get("analysis", {})
-        conflicts = analysis.get("conflicts", [])
-        
-        if events:
-            meet_lines = []
-            for m in events:
-                # Format time
-                dt_obj = datetime.fromisoformat(m["start"].replace('Z', '+00:00'))
-                time_str = dt_obj.strftime("%H:%M")
-                
-                # Tags & Icons
-                icon = "📅"
-                tags = ""
-                if "tags" in m and m["tags"]:
-                    tags = f" `{' '.join(m['tags'])}`"
-                    if "High Priority" in m["tags"]:
-                        icon = "⭐"
-                
-                line = f"{icon} *{time_str}*: <{m.get('link', '#')}|{m.get('summary', 'Untitled')}> {tags}"
-                meet_lines.append(line)
-            
-            # Conflict Warnings
-            if conflicts:
-                meet_lines.append("\n*⚠️ Conflicts Detected:*")
-                for c in conflicts:
-                    meet_lines.append(f"• {c['reason']}")
-
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*🗓️ Today's Schedule*\n" + "\n".join(meet_lines)
-                }
-            })
-        else:
-             blocks.append({
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": "*🗓️ Today's Schedule*\n_No events found on Google Calendar._"}
-            })
-
-        # Meeting Intelligence (Insights)
-        insights = data.get("meeting_insights", [])
-        has_insights = False
-        insight_blocks = []
-        
-        for i in insights:
-            analysis = i.get("analysis", {})
-            decisions = analysis.get("decisions", [])
-            actions = analysis.get("action_items", [])
-            
-            if decisions or actions:
-                has_insights = True
-                title = i.get("title", "Untitled")
-                
-                text = f"*🧠 {title}*\n"
-                if decisions:
-                    text += "*Decisions:*\n" + "\n".join([f"• {d}" for d in decisions]) + "\n"
-                if actions:
-                    text += "*Actions:*\n" + "\n".join([f"• {'☑️' if a['status']=='Done' else '🔲'} {a['task']}" for a in actions])
-                
-                insight_blocks.append({
-                    "type": "section",
-                    "text": {"type": "mrkdwn", "text": text}
-                })
-
-        if has_insights:
-            blocks.append({"type": "divider"})
-            blocks.append({
-                "type": "header", 
-                "text": {"type": "plain_text", "text": "Meeting Intelligence"}
-            })
-            blocks.extend(insight_blocks)
-
-        # Alerts (Emails)
-        emails = data.get("flagged_emails", [])
-        if emails:
-            email_lines = []
-            for e in emails:
-                line = f"🚨 *{e.get('subject', 'No Subject')}*\nFrom: {e.get('sender', 'Unknown')}"
-                email_lines.append(line)
-                
-            blocks.append({"type": "divider"})
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*📨 Urgent Comms*\n" + "\n\n".join(email_lines)
-                }
-            })
+        for name, keys in SECTION_INPUTS.items():
+            inputs = [data.get(key) for key in keys]
+            if _fingerprints is None:
+                key = (name, fingerprint(inputs))
+            else:
+                identity = (name,) + tuple(id(value) for value in inputs)
+                key = _fingerprints.get(identity)
+                if key is None:
+                    key = _fingerprints[identity] = (name, fingerprint(inputs))
+            entry = _fragments.get(key) if key else None
+            if entry is None:
+                fragment = SECTION_RENDERERS[name](*inputs)
+                if key:
+                    _fragments.set(key, fragment, 0)
+            else:
+                fragment = entry[0]
+            blocks.extend(fragment[0])
+            lines.extend(fragment[1])
 
-        # KPIs
-        metrics = data.get("metrics", [])
-        if metrics:
-            metric_lines = []
-            for m in metrics:
-                line = f"• *{m.get('metric', 'Metric')}*: {m.get('value', '0')}"
-                metric_lines.append(line)
-                
-            blocks.append({"type": "divider"})
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*📈 KPIs*\n" + "\n".join(metric_lines)
-                }
-            })
-            
+        generated_at = data.get('generated_at')
         blocks.append({
             "type": "context",
-            "elements": [{"type": "mrkdwn", "text": f"Generated at {data.get('generated_at')}"}]
+            "elements": [{"type": "mrkdwn", "text": _slack_footer(generated_at=generated_at)}]
         })
+        lines.append(_html_footer(generated_at=generated_at))
+        lines.append("</body></html>")
 
-        return {"blocks": blocks}
+        return {"blocks": blocks}, "\n".join(lines)
+
+    @staticmethod
+    def render_many(briefs):
+        """
+        Batch-sending mode: renders every brief, fingerprinting each shared section
+        object once. Briefs built from the same shared sources (tasks, meetings, KPIs)
+        hold the same objects, and the batch keeps them alive, so ids are stable.
+        """
+        uses = Counter(
+            (name,) + tuple(id(brief.get(key)) for key in keys)
+            for brief in briefs for name, keys in SECTION_INPUTS.items()
+        )
+        # Sections used by a single brief (a user's own schedule and emails) would
+        # cost more to fingerprint than to render: mark them uncached (False)
+        fingerprints = {identity: False for identity, count in uses.items() if count == 1}
+        return [BriefStylizer.render(brief, fingerprints) for brief in briefs]
+
+    @staticmethod
+    def to_slack_blocks(data):
+        """Converts daily brief data to Slack Block Kit format."""
+        return BriefStylizer.render(data)[0]
 
     @staticmethod
     def to_email_html(data):
         """Converts daily brief data to HTML Email format."""
-        date_str = data.get("date", "Today")
-        summary = data.get("summary", {})
-        
-        # Styles
-        style = """
-        <style>
-            body { font-family: Arial, sans-serif; color: #333; max-width: 600px; margin: 0 auto; }
-            h1 { font-size: 24px; color: #2c3e50; border-bottom: 2px solid #eee; padding-bottom: 10px; }
-            h2 { font-size: 18px; color: #2980b9; margin-top: 20px; }
-            .summary { margin-bottom: 20px; background: #f9f9f9; padding: 15px; border-radius: 5px; }
-            .summary span { margin-right: 15px; font-weight: bold; }
-            ul { list-style-type: none; padding: 0; }
-            li { padding: 8px 0; border-bottom: 1px solid #eee; }
-            .urgent { color: #c0392b; font-weight: bold; }
-            .footer { font-size: 12px; color: #999; margin-top: 30px; border-top: 1px solid #eee; padding-top: 10px; }
-            a { color: #3498db; text-decoration: none; }
-        </style>
-        """
-        
-        html = [f"<html><head>{style}</head><body>"]
-        html.append(f"<h1>Daily Executive Brief 📅 {date_str}</h1>")
-        
-        # Summary
-        html.append(f"""
-        <div class="summary">
-            <span>Tasks: {summary.get('task_count', 0)}</span>
-            <span>Meetings: {summary.get('meeting_count', 0)}</span>
-            <span>Urgent: {summary.get('urgent_email_count', 0)}</span>
-        </div>
-        """)
-        
+        return BriefStylizer.render(data)[1]
+
+    # Section renderers: each returns (Slack blocks, HTML lines) from the section's inputs
+
+    @staticmethod
+    def _render_tasks(tasks):
         # Priorities (Work Order)
-        html.append("<h2>🏆 Work Order (Top 5)</h2><ul>")
-        tasks = data.get("priorities", [])
-        if tasks:
-            for t in tasks:
-                status_icon = "✅" if t.get("status") == "Done" else "⭕"
-                prio = t.get("priority", "Medium")
-                score = t.get("score", 0)
-                
-                color = "#000"
-                if prio == "High": color = "#d35400"
-                
-                html.append(f"<li><span style='background:#eee; padding:2px 5px; border-radius:3px; font-family:monospace; margin-right:5px;'>{score}</span> <span style='color:{color}; font-weight:bold;'>{prio}</span> {status_icon} <a href='{t.get('url', '#')}'>{t.get('title', 'Untitled')}</a></li>")
-        else:
-            html.append("<li><i>No tasks found.</i></li>")
-        html.append("</ul>")
+        if not tasks:
+            return (
+                [_mrkdwn("*🏆 Work Order*\n_No tasks found._")],
+                ["<h2>🏆 Work Order (Top 5)</h2><ul>", "<li><i>No tasks found.</i></li>", "</ul>"]
+            )
+
+        slack_lines = []
+        html_lines = ["<h2>🏆 Work Order (Top 5)</h2><ul>"]
+        for t in tasks:
+            status = t.get("status")
+            score = t.get("score", 0)
+            prio = t.get("priority", "Medium")
+            url = t.get('url') or '#'
+            title = t.get('title', 'Untitled')
+
+            slack_lines.append(_slack_task(
+                score=f"`{_s(score)}`" if score else "",
+                priority_icon="🔥" if prio == "High" else "🔽" if prio == "Low" else "🔹",
+                status_icon="✅" if status == "Done" else "⚠️" if status == "In progress" else "⭕",
+                url=url,
+                title=title
+            ))
+            html_lines.append(_html_task(
+                score=score,
+                color="#d35400" if prio == "High" else "#000",
+                priority=prio,
+                icon="✅" if status == "Done" else "⭕",
+                url=url,
+                title=title
+            ))
+        html_lines.append("</ul>")
 
+        return [_mrkdwn("*🏆 Work Order (Top 5)*\n" + "\n".join(slack_lines))], html_lines
+
+    @staticmethod
+    def _render_schedule(schedule):
         # Schedule (New Calendar Intelligence)
-        schedule = data.get("schedule", {})
+        schedule = schedule or {}
         events = schedule.get("events", [])
-        analysis = schedule.get("analysis", {})
-        conflicts = analysis.get("conflicts", [])
-        
-        html.append("<h2>🗓️ Today's Schedule</h2>")
-        
+        conflicts = schedule.get("analysis", {}).get("conflicts", [])
+
+        html_lines = ["<h2>🗓️ Today's Schedule</h2>"]
         if conflicts:
-            html.append("<div style='background:#ffe6e6; padding:10px; border:1px solid #ffcccc; margin-bottom:10px;'>")
-            html.append("<b>⚠️ Conflicts Detected:</b><ul>")
-            for c in conflicts:
-                html.append(f"<li>{c['reason']}</li>")
-            html.append("</ul></div>")
-
-        if events:
-            html.append("<ul>")
-            for m in events:
-                dt_obj = datetime.fromisoformat(m["start"].replace('Z', '+00:00'))
-                time_str = dt_obj.strftime("%H:%M")
-                
-                tags = ""
-                style = ""
-                if "tags" in m and "High Priority" in m["tags"]:
-                     tags = "<span style='background:#fff3cd; padding:2px 5px; border-radius:3px; font-size:0.8em; margin-left:5px;'>⭐ High Priority</span>"
-                     style = "font-weight:bold;"
-                     
-                html.append(f"<li style='{style}'>{time_str}: <a href='{m.get('link', '#')}'>{m.get('summary', 'Untitled')}</a> {tags}</li>")
-            html.append("</ul>")
-        else:
-            html.append("<p><i>No events found on Google Calendar.</i></p>")
-        
-        # Meeting Intelligence
-        insights = data.get("meeting_insights", [])
-        has_insights = False
-        insight_html = []
-        
-        for i in insights:
+            html_lines.append("<div style='background:#ffe6e6; padding:10px; border:1px solid #ffcccc; margin-bottom:10px;'>")
+            html_lines.append("<b>⚠️ Conflicts Detected:</b><ul>")
+            html_lines.extend(_html_item(text=c['reason']) for c in conflicts)
+            html_lines.append("</ul></div>")
+
+        if not events:
+            html_lines.append("<p><i>No events found on Google Calendar.</i></p>")
+            return [_mrkdwn("*🗓️ Today's Schedule*\n_No events found on Google Calendar._")], html_lines
+
+        slack_lines = []
+        html_lines.append("<ul>")
+        for m in events:
+            # Timestamp is read once for both outputs
+            time_str = _time_label(m["start"])
+            tags = m.get("tags") or []
+            high_priority = "High Priority" in tags
+            url = m.get('link') or '#'
+            summary = m.get('summary', 'Untitled')
+
+            slack_lines.append(_slack_event(
+                icon="⭐" if high_priority else "📅",
+                time=time_str,
+                url=url,
+                summary=summary,
+                tags=f" `{_s(' '.join(tags))}`" if tags else ""
+            ))
+            html_lines.append(_html_event(
+                style="font-weight:bold;" if high_priority else "",
+                time=time_str,
+                url=url,
+                summary=summary,
+                tags=HTML_HIGH_PRIORITY if high_priority else ""
+            ))
+        html_lines.append("</ul>")
+
+        # Conflict Warnings
+        if conflicts:
+            slack_lines.append("\n*⚠️ Conflicts Detected:*")
+            slack_lines.extend(_slack_bullet(text=c['reason']) for c in conflicts)
+
+        return [_mrkdwn("*🗓️ Today's Schedule*\n" + "\n".join(slack_lines))], html_lines
+
+    @staticmethod
+    def _render_insights(insights):
+        # Meeting Intelligence (Insights)
+        blocks = []
+        html_lines = []
+        for i in insights or []:
             analysis = i.get("analysis", {})
             decisions = analysis.get("decisions", [])
             actions = analysis.get("action_items", [])
-            
-            if decisions or actions:
-                has_insights = True
-                title = i.get("title", "Untitled")
-                
-                insight_html.append(f"<h3>🧠 {title}</h3>")
-                if decisions:
-                    insight_html.append("<b>Decisions:</b><ul>")
-                    for d in decisions:
-                        insight_html.append(f"<li>{d}</li>")
-                    insight_html.append("</ul>")
-                if actions:
-                    insight_html.append("<b>Actions:</b><ul>")
-                    for a in actions:
-                        status_icon = "☑️" if a['status']=='Done' else "🔲"
-                        insight_html.append(f"<li>{status_icon} {a['task']}</li>")
-                    insight_html.append("</ul>")
-
-        if has_insights:
-            html.append("<h2>Meeting Intelligence</h2>")
-            html.extend(insight_html)
-
-        # Alerts
-        emails = data.get("flagged_emails", [])
-        if emails:
-             html.append("<h2>📨 Urgent Comms</h2><ul>")
-             for e in emails:
-                 html.append(f"<li class='urgent'>🚨 {e.get('subject', 'No Subject')}<br/><small style='color:#666; font-weight:normal;'>From: {e.get('sender', 'Unknown')}</small></li>")
-             html.append("</ul>")
-             
+            if not (decisions or actions):
+                continue
+
+            title = i.get("title", "Untitled")
+            text = f"*🧠 {_s(title)}*\n"
+            html_lines.append(_html_insight_title(title=title))
+            if decisions:
+                text += "*Decisions:*\n" + "\n".join(_slack_bullet(text=d) for d in decisions) + "\n"
+                html_lines.append("<b>Decisions:</b><ul>")
+                html_lines.extend(_html_item(text=d) for d in decisions)
+                html_lines.append("</ul>")
+            if actions:
+                icons = ["☑️" if a['status'] == 'Done' else "🔲" for a in actions]
+                text += "*Actions:*\n" + "\n".join(_slack_action(icon=icon, task=a['task']) for icon, a in zip(icons, actions))
+                html_lines.append("<b>Actions:</b><ul>")
+                html_lines.extend(_html_action(icon=icon, task=a['task']) for icon, a in zip(icons, actions))
+                html_lines.append("</ul>")
+            blocks.append(_mrkdwn(text))
+
+        if not blocks:
+            return [], []
+        return (
+            [{"type": "divider"}, {"type": "header", "text": {"type": "plain_text", "text": "Meeting Intelligence"}}] + blocks,
+            ["<h2>Meeting Intelligence</h2>"] + html_lines
+        )
+
+    @staticmethod
+    def _render_emails(emails):
+        # Alerts (Emails)
+        if not emails:
+            return [], []
+
+        slack_lines = []
+        html_lines = ["<h2>📨 Urgent Comms</h2><ul>"]
+        for e in emails:
+            subject = e.get('subject', 'No Subject')
+            sender = e.get('sender', 'Unknown')
+            slack_lines.append(_slack_email(subject=subject, sender=sender))
+            html_lines.append(_html_email(subject=subject, sender=sender))
+        html_lines.append("</ul>")
+
+        return [{"type": "divider"}, _mrkdwn("*📨 Urgent Comms*\n" + "\n\n".join(slack_lines))], html_lines
+
+    @staticmethod
+    def _render_metrics(metrics):
         # KPIs
-        metrics = data.get("metrics", [])
-        if metrics:
-            html.append("<h2>📈 KPIs</h2><ul>")
-            for m in metrics:
-                html.append(f"<li><b>{m.get('metric', 'Metric')}</b>: {m.get('value', '0')}</li>")
-            html.append("</ul>")
-            
-        # Footer
-        html.append(f"<div class='footer'>Generated at {data.get('generated_at')}</div>")
-        html.append("</body></html>")
-        
-        return "\n".join(html)
+        if not metrics:
+            return [], []
+
+        slack_lines = []
+        html_lines = ["<h2>📈 KPIs</h2><ul>"]
+        for m in metrics:
+            metric = m.get('metric', 'Metric')
+            value = m.get('value', '0')
+            slack_lines.append(_slack_metric(metric=metric, value=value))
+            html_lines.append(_html_metric(metric=metric, value=value))
+        html_lines.append("</ul>")
+
+        return [{"type": "divider"}, _mrkdwn("*📈 KPIs*\n" + "\n".join(slack_lines))], html_lines
+
+SECTION_RENDERERS = {
+    "tasks": BriefStylizer._render_tasks,
+    "schedule": BriefStylizer._render_schedule,
+    "insights": BriefStylizer._render_insights,
+    "emails": BriefStylizer._render_emails,
+    "metrics": BriefStylizer._render_metrics,
+}
 
 if __name__ == "__main__":
     # Test stub
     mock_data = {
-        "date": "2026-02-01", 
+        "date": "2026-02-01",
         "summary": {"task_count": 1},
         "priorities": [{"title": "Test Task", "status": "In Progress"}],
         "meeting_summaries": [],
@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from tools.utils.config import Config
+
+# Fresh lifetime per source (seconds). Within `ttl * STALE_FACTOR` an expired entry is
+# still served while a background refresh runs (stale-while-revalidate).
+SOURCE_TTLS = {
+    "tasks": 300,
+    "meetings": 600,
+    "schedule": 300,
+    "emails": 120,
+    "metrics": 900,
+}
+DEFAULT_TTL = 300
+STALE_FACTOR = 6
+
+def fingerprint(value):
+    """Stable content hash of a JSON-like value, used to detect unchanged brief sections."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+class MemoryBackend:
+    """In-process LRU store. Values are kept as-is."""
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at):
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+class SQLiteBackend:
+    """Disk-backed LRU store, shared by processes on the same host. Values must be JSON-serializable."""
+    def __init__(self, path, max_entries=1024):
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT, stored_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_response_cache_accessed ON response_cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE response_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return json.loads(row[0]), row[1]
+
+    def set(self, key, value, stored_at):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), stored_at, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+class ResponseCache:
+    """
+    Read-through cache for source fetches, keyed by user + source + query.
+    Fresh entries are returned directly; stale ones are returned immediately while
+    a single background refresh per key updates the backend.
+    """
+    def __init__(self, backend, ttls=None):
+        self.backend = backend
+        self.ttls = dict(SOURCE_TTLS, **(ttls or {}))
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+    @staticmethod
+    def make_key(user, source, query=None):
+        return json.dumps([user, source, query], sort_keys=True, default=str)
+
+    def get_or_fetch(self, user, source, query, fetch, ttl=None):
+        key = self.make_key(user, source, query)
+        ttl = ttl or self.ttls.get(source, DEFAULT_TTL)
+
+        entry = self.backend.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < ttl:
+                return value
+            if age < ttl * STALE_FACTOR:
+                self._refresh_in_background(key, fetch)
+                return value
+
+        return self._fetch_and_store(key, fetch)
+
+    def invalidate(self, user, source, query=None):
+        self.backend.delete(self.make_key(user, source, query))
+
+    def _fetch_and_store(self, key, fetch):
+        value = fetch()
+        self.backend.set(key, value, time.time())
+        return value
+
+    def _refresh_in_background(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch_and_store(key, fetch)
+            except Exception as e:
+                print(f"[WARN] Background cache refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._pool.submit(refresh)
+
+class NullCache:
+    """Used when caching is disabled (CACHE_BACKEND=off)."""
+    def get_or_fetch(self, user, source, query, fetch, ttl=None):
+        return fetch()
+
+    def invalidate(self, user, source, query=None):
+        pass
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Process-wide cache configured by CACHE_BACKEND (memory | sqlite | off)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            backend = (Config.CACHE_BACKEND or "memory").lower()
+            if backend == "off":
+                _cache = NullCache()
+            elif backend == "sqlite":
+                _cache = ResponseCache(SQLiteBackend(Config.CACHE_PATH, max_entries=Config.CACHE_MAX_ENTRIES))
+            else:
+                _cache = ResponseCache(MemoryBackend(max_entries=Config.CACHE_MAX_ENTRIES))
+        return _cache
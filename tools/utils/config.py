@@ -2,8 +2,8 @@ import os
 import sys
 from dotenv import load_dotenv
 
-# Load .env file
-load_dotenv()
+# Load .env from the project root (an explicit path skips find_dotenv's directory walk)
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
 
 def get_env_var(name, required=True):
     val = os.getenv(name)
@@ -17,14 +17,38 @@ class Config:
     NOTION_API_KEY = get_env_var("NOTION_API_KEY", required=False)
     NOTION_TASK_DB_ID = get_env_var("NOTION_TASK_DB_ID", required=False)
     NOTION_MEETING_DB_ID = get_env_var("NOTION_MEETING_DB_ID", required=False)
+    # Notion allows ~3 requests/second per integration; cap parallel block walks accordingly
+    NOTION_MAX_CONCURRENCY = int(get_env_var("NOTION_MAX_CONCURRENCY", required=False) or 3)
+    # Shared Notion gateway token bucket (requests/second and burst size)
+    NOTION_RATE_LIMIT = float(get_env_var("NOTION_RATE_LIMIT", required=False) or 3)
+    NOTION_RATE_BURST = int(get_env_var("NOTION_RATE_BURST", required=False) or 3)
     
     SLACK_WEBHOOK_URL = get_env_var("SLACK_WEBHOOK_URL", required=False)
+    # Slack delivery: parallel webhooks, retries on 429/5xx, per-request timeout (seconds)
+    SLACK_MAX_CONCURRENCY = int(get_env_var("SLACK_MAX_CONCURRENCY", required=False) or 4)
+    SLACK_MAX_RETRIES = int(get_env_var("SLACK_MAX_RETRIES", required=False) or 5)
+    SLACK_TIMEOUT = float(get_env_var("SLACK_TIMEOUT", required=False) or 10)
+    SLACK_DELIVERY_LOG = get_env_var("SLACK_DELIVERY_LOG", required=False) or os.path.join(
+        os.path.dirname(__file__), "..", "..", ".tmp", "slack_deliveries.jsonl"
+    )
     
     GOOGLE_CREDS_PATH = get_env_var("GOOGLE_APPLICATION_CREDENTIALS", required=False)
     GOOGLE_CLIENT_SECRET_PATH = "client_secret.json" # Expected in root for OAuth flow
     GOOGLE_SHEET_ID = get_env_var("GOOGLE_SHEET_ID", required=False)
     GMAIL_SUBJECT = get_env_var("GMAIL_SUBJECT", required=False) # Email to impersonate if using domain-wide delegation
 
+    # Brief fan-out (seconds). Sources slower than their timeout are dropped from the brief.
+    BRIEF_SOURCE_TIMEOUT = float(get_env_var("BRIEF_SOURCE_TIMEOUT", required=False) or 20)
+    BRIEF_DEADLINE = float(get_env_var("BRIEF_DEADLINE", required=False) or 30)
+    BRIEF_SOURCE_WORKERS = int(get_env_var("BRIEF_SOURCE_WORKERS", required=False) or 16)
+
+    # Source response cache: "memory" (default), "sqlite" (shared on-disk) or "off"
+    CACHE_BACKEND = get_env_var("CACHE_BACKEND", required=False) or "memory"
+    CACHE_PATH = get_env_var("CACHE_PATH", required=False) or os.path.join(
+        os.path.dirname(__file__), "..", "..", ".tmp", "response_cache.db"
+    )
+    CACHE_MAX_ENTRIES = int(get_env_var("CACHE_MAX_ENTRIES", required=False) or 1024)
+
     @classmethod
     def validate(cls):
         missing = []
@@ -0,0 +1,102 @@
+import json
+import threading
+from collections import OrderedDict
+
+# googleapiclient and friends are imported on first use: they are slow to load
+# and only needed once a brief talks to Google
+
+# Bounded so long-running servers don't keep a client for every user forever
+MAX_SERVICES = 256
+HTTP_TIMEOUT = 30
+
+_docs = {}
+_services = OrderedDict()
+_service_account_creds = {}
+_lock = threading.Lock()
+
+class _ThreadLocalHttp:
+    """
+    httplib2.Http keeps connections alive but is not thread-safe, so each thread
+    gets its own Http (and connection pool) behind one shared object.
+    """
+    def __init__(self, timeout=HTTP_TIMEOUT):
+        self._timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import httplib2
+            http = self._local.http = httplib2.Http(timeout=self._timeout)
+        return http
+
+    def request(self, *args, **kwargs):
+        return self.http.request(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+def _discovery_doc(api, version):
+    """Bundled (static) discovery document, parsed once per process."""
+    key = (api, version)
+    doc = _docs.get(key)
+    if doc is None:
+        from googleapiclient import discovery_cache
+        content = discovery_cache.get_static_doc(api, version)
+        doc = json.loads(content) if content else None
+        _docs[key] = doc
+    return doc
+
+def _credentials_key(creds):
+    # Stable across requests for the same account, unlike the Credentials object itself
+    identity = (
+        getattr(creds, "service_account_email", None)
+        or getattr(creds, "refresh_token", None)
+        or getattr(creds, "token", None)
+        or id(creds)
+    )
+    return type(creds).__name__, identity
+
+def get_service(api, version, creds):
+    """
+    Returns a cached API client for (api, version, credentials). Discovery documents
+    come from the library's static copies and are parsed once; the HTTP transport
+    is reused for every call made for the same account, rebound to the caller's
+    current Credentials object.
+    """
+    key = (api, version, _credentials_key(creds))
+    with _lock:
+        service = _services.get(key)
+        if service is not None:
+            _services.move_to_end(key)
+            # Same account, possibly a newer Credentials (re-login, credential cache
+            # eviction): refresh through the object whose owner persists the token
+            service._http.credentials = creds
+            return service
+
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.discovery import build, build_from_document
+
+        doc = _discovery_doc(api, version)
+        http = AuthorizedHttp(creds, http=_ThreadLocalHttp())
+        if doc:
+            service = build_from_document(doc, http=http)
+        else:
+            service = build(api, version, http=http)
+
+        _services[key] = service
+        while len(_services) > MAX_SERVICES:
+            _services.popitem(last=False)
+        return service
+
+def get_service_account_credentials(path, scopes):
+    """Loads a service account key file once per (path, scopes)."""
+    key = (path, tuple(scopes))
+    with _lock:
+        creds = _service_account_creds.get(key)
+        if creds is None:
+            from google.oauth2 import service_account
+            creds = service_account.Credentials.from_service_account_file(path, scopes=scopes)
+            _service_account_creds[key] = creds
+        return creds
@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+import heapq
+import random
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+import httpx
+from notion_client import Client
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from tools.utils.config import Config
+
+# Lower value is served first
+PRIORITY_CRITICAL = 0 # Queries a brief is waiting on
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2 # Debug/inspection tools, warm-ups
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_BACKOFF = 30
+
+_priority = contextvars.ContextVar("notion_priority", default=PRIORITY_NORMAL)
+
+@contextmanager
+def notion_priority(level):
+    """Runs the enclosed Notion calls at `level` (inherited by copied contexts)."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+class TokenBucketScheduler:
+    """
+    Token bucket shared by all threads. Waiting callers are released in priority
+    order (FIFO within a priority); `pause` stops everyone after a 429.
+    """
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=PRIORITY_NORMAL):
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._waiters[0] == ticket and self._tokens >= 1 and now >= self._paused_until:
+                    heapq.heappop(self._waiters)
+                    self._tokens -= 1
+                    self._cond.notify_all()
+                    return
+
+                wait = self._paused_until - now
+                if self._tokens < 1:
+                    wait = max(wait, (1 - self._tokens) / self.rate)
+                # Non-head waiters sleep until the head takes its token and notifies
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def pause(self, seconds):
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+            self._cond.notify_all()
+
+class NotionGateway(Client):
+    """
+    notion_client.Client with a pooled keep-alive HTTP client, a shared rate
+    limiter, and 429/5xx retries that honour Retry-After.
+    """
+    def __init__(self, auth, scheduler, max_retries=5, pool_size=10):
+        http = httpx.Client(limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        ))
+        super().__init__(auth=auth, client=http)
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+
+    def request(self, path, method, query=None, body=None, auth=None):
+        for attempt in range(self.max_retries + 1):
+            self.scheduler.acquire(_priority.get())
+            try:
+                return super().request(path, method, query=query, body=body, auth=auth)
+            except (HTTPResponseError, RequestTimeoutError) as e:
+                status = getattr(e, "status", None)
+                retryable = isinstance(e, RequestTimeoutError) or status in RETRY_STATUSES
+                if not retryable or attempt == self.max_retries:
+                    raise
+
+                retry_after = getattr(e, "headers", {}).get("Retry-After") if status else None
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = min(MAX_BACKOFF, 0.5 * 2 ** attempt) * random.uniform(0.8, 1.2)
+
+                print(f"[WARN] Notion {method.upper()} {path} -> {status or 'timeout'}; retrying in {delay:.1f}s")
+                if status == 429:
+                    # The limit is per integration: hold every caller, not just this one
+                    self.scheduler.pause(delay)
+                else:
+                    time.sleep(delay)
+
+_gateways = {}
+_gateways_lock = threading.Lock()
+
+def get_notion_client(api_key=None):
+    """Process-wide Notion client for `api_key` (default: Config.NOTION_API_KEY)."""
+    api_key = api_key or Config.NOTION_API_KEY
+    if not api_key:
+        return None
+    with _gateways_lock:
+        gateway = _gateways.get(api_key)
+        if gateway is None:
+            scheduler = TokenBucketScheduler(rate=Config.NOTION_RATE_LIMIT, burst=Config.NOTION_RATE_BURST)
+            gateway = NotionGateway(api_key, scheduler)
+            _gateways[api_key] = gateway
+        return gateway
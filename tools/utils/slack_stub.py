@@ -0,0 +1,106 @@
+import json
+import time
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubWebhookServer:
+    """
+    Local stand-in for a Slack incoming webhook, for tests and benchmarks.
+    Accepts POSTs on any path, records the JSON payloads, rejects messages over
+    50 blocks like Slack does, and replays scripted failures first:
+
+        with StubWebhookServer(script=[(429, {"Retry-After": "1"}), 500]) as stub:
+            SlackDelivery().deliver(stub.url, payload)
+            stub.received  # [(path, payload), ...]
+    """
+    def __init__(self, script=None, latency=0.0, host="127.0.0.1", port=0):
+        self.received = []
+        self.latency = latency
+        self._script = deque(script or [])
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/services/T000/B000/stub"
+
+    def _next_response(self, payload):
+        with self._lock:
+            if self._script:
+                step = self._script.popleft()
+                status, headers = step if isinstance(step, tuple) else (step, {})
+                return status, headers, "rate_limited" if status == 429 else "server_error"
+            if len(payload.get("blocks", [])) > 50:
+                return 400, {}, "invalid_blocks"
+            return 200, {}, "ok"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # keep-alive, like Slack
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    payload = None
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if payload is None:
+                    status, headers, text = 400, {}, "invalid_payload"
+                else:
+                    status, headers, text = stub._next_response(payload)
+                    if status == 200:
+                        with stub._lock:
+                            stub.received.append((self.path, payload))
+
+                data = text.encode()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="slack-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run a local stub Slack webhook (point SLACK_WEBHOOK_URL at it).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response.")
+    args = parser.parse_args()
+
+    stub = StubWebhookServer(latency=args.latency, port=args.port).start()
+    print(f"Stub Slack webhook listening: SLACK_WEBHOOK_URL={stub.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()